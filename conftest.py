@@ -0,0 +1,23 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from main import app
+from services import lore_db_service
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient (and app lifespan) shared by the whole test session."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def lore_db(tmp_path, monkeypatch):
+    """Point the lore service at a fresh, empty database for one test."""
+    monkeypatch.setattr(database, "DATABASE_PATH", tmp_path / "lore.db")
+    database.init_db()
+    lore_db_service._scenario_cache.clear()
+    yield lore_db_service
+    lore_db_service._scenario_cache.clear()
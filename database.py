@@ -12,6 +12,8 @@ def get_connection() -> sqlite3.Connection:
     """Get a database connection with row factory enabled."""
     conn = sqlite3.connect(DATABASE_PATH)
     conn.row_factory = sqlite3.Row
+    # Safe with WAL (set in init_db): commits no longer wait on an fsync of the main file
+    conn.execute("PRAGMA synchronous=NORMAL")
     return conn
 
 
@@ -34,6 +36,9 @@ def init_db():
     with get_db() as conn:
         cursor = conn.cursor()
 
+        # Write-ahead logging is persistent per database file
+        cursor.execute("PRAGMA journal_mode=WAL")
+
         # Scenarios table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS scenarios (
@@ -73,12 +78,18 @@ def init_db():
                 current_story_summary TEXT DEFAULT '',
                 memory TEXT DEFAULT '',
                 current_scene TEXT DEFAULT '{}',
+                context_version INTEGER NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (scenario_id) REFERENCES scenarios(id)
             )
         """)
 
+        # Databases created before context_version existed
+        adventure_columns = {row["name"] for row in cursor.execute("PRAGMA table_info(adventures)")}
+        if "context_version" not in adventure_columns:
+            cursor.execute("ALTER TABLE adventures ADD COLUMN context_version INTEGER NOT NULL DEFAULT 0")
+
         # Scenes table (scene history for an adventure)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS scenes (
@@ -143,11 +154,60 @@ def init_db():
         """)
 
         # Create indexes for better query performance
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scenarios_updated ON scenarios(updated_at DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scenarios_status_updated ON scenarios(status, updated_at DESC)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_story_cards_scenario ON story_cards(scenario_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_adventures_scenario ON adventures(scenario_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_adventure ON events(adventure_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_adventures_updated ON adventures(updated_at DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_adventures_scenario_updated ON adventures(scenario_id, updated_at DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_adventure_created ON events(adventure_id, created_at)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_scenes_adventure ON scenes(adventure_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_character_states_adventure ON character_states(adventure_id)")
+        # character_states(adventure_id, character_name) is covered by its UNIQUE constraint
+
+        # Superseded by the composite indexes above
+        cursor.execute("DROP INDEX IF EXISTS idx_adventures_scenario")
+        cursor.execute("DROP INDEX IF EXISTS idx_events_adventure")
+        cursor.execute("DROP INDEX IF EXISTS idx_character_states_adventure")
+
+        # Stamp updated_at in SQLite on every UPDATE so callers don't have to pass it.
+        # An adventure's context_version bumps (below) are not edits of it and leave updated_at alone;
+        # its trigger is recreated so databases from before that rule pick it up.
+        cursor.execute("DROP TRIGGER IF EXISTS trg_adventures_updated_at")
+        for table in ("scenarios", "story_cards", "adventures", "scenes", "character_states"):
+            when = "WHEN NEW.context_version IS OLD.context_version" if table == "adventures" else ""
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_updated_at
+                AFTER UPDATE ON {table} {when}
+                BEGIN
+                    UPDATE {table} SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                END
+            """)
+
+        # Bump adventures.context_version on every write that feeds an adventure's story
+        # context, so caches keyed on it stay valid across processes. Each source maps to
+        # the adventures it affects (a WHERE clause on adventures) and the writes to watch.
+        context_sources = {
+            "adventures": ("id = {row}.id", ("UPDATE",)),
+            "scenarios": ("scenario_id = {row}.id", ("UPDATE",)),
+            "story_cards": ("scenario_id = {row}.scenario_id", ("INSERT", "UPDATE", "DELETE")),
+            "events": ("id = {row}.adventure_id", ("INSERT", "UPDATE", "DELETE")),
+            "character_states": ("id = {row}.adventure_id", ("INSERT", "UPDATE", "DELETE")),
+        }
+        for table, (target, writes) in context_sources.items():
+            # Watch content columns only, so the updated_at triggers and the bump itself don't re-fire it
+            content_columns = ", ".join(
+                row["name"] for row in cursor.execute(f"PRAGMA table_info({table})")
+                if row["name"] not in ("id", "created_at", "updated_at", "context_version")
+            )
+            for write in writes:
+                ref = "OLD" if write == "DELETE" else "NEW"
+                watched = f"UPDATE OF {content_columns}" if write == "UPDATE" else write
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{write.lower()}_context_version
+                    AFTER {watched} ON {table}
+                    BEGIN
+                        UPDATE adventures SET context_version = context_version + 1 WHERE {target.format(row=ref)};
+                    END
+                """)
 
 
 # Initialize database on module import
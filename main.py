@@ -1,9 +1,20 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from routers import pages, api
 from routers import lore_pages, lore_api
+from services import lore_db_service, lore_llm_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lore_llm_service.open_http_client()
+    yield
+    await lore_llm_service.close_http_client()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 # Mount static files if needed (currently using CDN for HTMX/Tailwind)
 # app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -15,3 +26,10 @@ app.include_router(api.router)
 # Lore (role-playing/story writing) routes
 app.include_router(lore_pages.router)
 app.include_router(lore_api.router)
+
+# Per-request Lore read cache
+@app.middleware("http")
+async def lore_request_cache(request: Request, call_next):
+    """Share Lore scenario/adventure reads across a single request."""
+    with lore_db_service.request_cache():
+        return await call_next(request)
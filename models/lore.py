@@ -159,7 +159,7 @@ class CharacterState:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class CharacterAction:
     """A structured action taken by a character (PC or NPC)."""
     character_name: str
@@ -200,7 +200,7 @@ class CharacterAction:
         return " ".join(parts) if parts else ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     """Tracks the current scene state in an adventure."""
     id: Optional[int] = None
@@ -265,7 +265,7 @@ class Scene:
         return "\n".join(parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class Plot:
     """The plot defines the initial state and context of an adventure."""
     story: str = ""
@@ -346,6 +346,27 @@ class Scenario:
         }
 
 
+@dataclass
+class ScenarioSummary:
+    """Lightweight scenario listing entry without plot or story cards."""
+    id: Optional[int] = None
+    title: str = ""
+    description: str = ""
+    status: ScenarioStatus = ScenarioStatus.DRAFT
+    tags: list[str] = field(default_factory=list)
+    updated_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "tags": self.tags,
+            "status": self.status.value if isinstance(self.status, ScenarioStatus) else self.status,
+            "updated_at": self.updated_at
+        }
+
+
 @dataclass
 class Event:
     """An event in the adventure history."""
@@ -395,6 +416,7 @@ class Adventure:
     memory: str = ""  # Active context for LLM
     current_scene: Optional[Scene] = None  # Current scene state
     history: list[Event] = field(default_factory=list)
+    context_version: int = 0  # Bumped by the database on every write that feeds the story context
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -421,3 +443,25 @@ class Adventure:
             return []
         npc_cards = [c for c in all_cards if c.type == StoryCardType.CHARACTER]
         return [c for c in npc_cards if c.name in self.current_scene.characters_present]
+
+
+@dataclass
+class AdventureSummary:
+    """Lightweight adventure listing entry without scene or event history."""
+    id: Optional[int] = None
+    scenario_id: Optional[int] = None
+    title: str = ""
+    current_story_summary: str = ""
+    memory: str = ""
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "scenario_id": self.scenario_id,
+            "title": self.title,
+            "current_story_summary": self.current_story_summary,
+            "memory": self.memory,
+            "updated_at": self.updated_at
+        }
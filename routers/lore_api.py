@@ -2,6 +2,7 @@
 Lore API router - REST API endpoints for the role-playing feature.
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from models.lore import Plot, StoryCardType, ActionType, ScenarioStatus
@@ -235,7 +236,6 @@ async def start_adventure(adventure_id: int):
     """Generate the opening scene for an adventure."""
     try:
         opening = await llm.generate_opening_scene(adventure_id)
-        db.add_event(adventure_id, ActionType.STORY, "[Adventure begins]", opening)
         return {"opening": opening}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -243,6 +243,26 @@ async def start_adventure(adventure_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/adventures/{adventure_id}/start/stream")
+async def stream_start_adventure(adventure_id: int):
+    """
+    Stream the opening scene narration as plain text while it is generated.
+
+    The stream ends with llm.STREAM_RESULT_SEPARATOR and the opening result as
+    JSON, or {"error": ...} if it failed.
+    """
+    adventure = db.get_adventure(adventure_id)
+    if not adventure:
+        raise HTTPException(status_code=404, detail="Adventure not found")
+    scenario = db.get_scenario(adventure.scenario_id)
+    if not scenario:
+        raise HTTPException(status_code=404, detail="Scenario not found")
+    return StreamingResponse(
+        llm.stream_opening_scene(adventure_id, adventure=adventure, scenario=scenario),
+        media_type="text/plain"
+    )
+
+
 @router.post("/adventures/{adventure_id}/action")
 async def take_action(adventure_id: int, data: ActionInput):
     """Take an action in an adventure."""
@@ -259,6 +279,32 @@ async def take_action(adventure_id: int, data: ActionInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/adventures/{adventure_id}/action/stream")
+async def stream_action(adventure_id: int, data: ActionInput):
+    """
+    Stream the Story Orchestrator output as plain text while the turn is generated.
+
+    The stream ends with llm.STREAM_RESULT_SEPARATOR and the turn result (NPC
+    voices included) as JSON, or {"error": ...} if the turn failed.
+    """
+    try:
+        action_type = ActionType(data.action_type)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid action_type: {data.action_type}")
+    adventure = db.get_adventure(adventure_id)
+    if not adventure:
+        raise HTTPException(status_code=404, detail="Adventure not found")
+    return StreamingResponse(
+        llm.stream_continue_story(
+            adventure_id,
+            data.player_input,
+            action_type,
+            adventure=adventure
+        ),
+        media_type="text/plain"
+    )
+
+
 @router.post("/adventures/{adventure_id}/undo")
 async def undo_action(adventure_id: int):
     """Undo the last action in an adventure."""
@@ -311,3 +357,9 @@ async def update_settings(data: SettingsUpdate):
         api_base=data.api_base
     )
     return {"settings": settings}
+
+
+@router.post("/settings/reload-prompts")
+async def reload_prompts():
+    """Re-read prompt templates from disk without restarting the server."""
+    return {"reloaded": llm.reload_prompts()}
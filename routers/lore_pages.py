@@ -207,7 +207,7 @@ async def start_adventure(request: Request, scenario_id: int, title: str = Form(
         adventure = db.create_adventure(scenario_id, title)
 
         # Generate opening scene (now returns dict with narration, scene, etc.)
-        result = await llm.generate_opening_scene(adventure.id)
+        result = await llm.generate_opening_scene(adventure.id, adventure=adventure)
 
         # Get updated adventure
         adventure = db.get_adventure(adventure.id)
@@ -1,4 +1,4 @@
-from litellm import completion
+from litellm import acompletion
 from state import settings
 
 async def get_chat_completion(message: str) -> str:
@@ -24,7 +24,7 @@ async def get_chat_completion(message: str) -> str:
         kwargs["custom_llm_provider"] = "openai"
         kwargs["api_key"] = "dummy"
 
-    response = completion(**kwargs)
+    response = await acompletion(**kwargs)
     return response.choices[0].message.content
 
 def update_settings(model: str, api_base: str | None = None) -> dict:
@@ -1,33 +1,99 @@
 """
 Database service for Lore CRUD operations.
 """
+import asyncio
 import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
+
+import orjson
 
 from database import get_db
 from models.lore import (
-    Scenario, ScenarioStatus, Plot,
+    Scenario, ScenarioSummary, ScenarioStatus, Plot,
     StoryCard, StoryCardType,
-    Adventure, Event, ActionType,
+    Adventure, AdventureSummary, Event, ActionType,
     Scene, CharacterAction, CharacterState
 )
 
+# Pre-serialized values for the common empty/default JSON columns
+_EMPTY_LIST_JSON = "[]"
+_EMPTY_DICT_JSON = "{}"
+_DEFAULT_PLOT_JSON = json.dumps(Plot().to_dict())
+
+# Column order expected by _row_to_event
+_EVENT_COLUMNS = "id, adventure_id, action_type, actor_name, player_input, narration, character_actions, scene_update, created_at"
+# Same columns with narration cut to a bound length in SQL (first parameter)
+_EVENT_SNIPPET_COLUMNS = "id, adventure_id, action_type, actor_name, player_input, substr(narration, 1, ?), character_actions, scene_update, created_at"
+
+_STATE_COLUMNS = (
+    "id", "adventure_id", "character_name", "character_card_id", "is_pc", "personality_traits",
+    "char_values", "fears", "speech_style", "current_mood", "current_goal", "long_term_goals",
+    "inventory", "equipped", "relationships", "stats", "recent_actions_summary", "created_at", "updated_at",
+)
+# character_states columns prefixed with cs_ so they can be selected next to story_cards
+_STATE_JOIN_COLUMNS = ", ".join(f"cs.{c} AS cs_{c}" for c in _STATE_COLUMNS)
+
+# Request-scoped memo of get_scenario/get_adventure results, keyed by (kind, id).
+# Only active inside request_cache(); writes in this module drop the affected entries,
+# and adventures are additionally revalidated against updated_at.
+_request_cache: ContextVar[Optional[dict]] = ContextVar("lore_request_cache", default=None)
+
+
+# Process-wide TTL cache of get_scenario results; scenarios change rarely and every
+# write in this module invalidates the affected entry.
+SCENARIO_CACHE_TTL = 300  # seconds
+_scenario_cache: dict[int, tuple[float, Scenario]] = {}
+
+
+@contextmanager
+def request_cache():
+    """Memoize scenario/adventure reads for the duration of a single request."""
+    token = _request_cache.set({})
+    try:
+        yield
+    finally:
+        _request_cache.reset(token)
+
+
+def _invalidate(kind: str, key_id: int = None):
+    """Drop a cached scenario/adventure (or every entry of that kind) after a write."""
+    if kind == "scenario":
+        if key_id is not None:
+            _scenario_cache.pop(key_id, None)
+        else:
+            _scenario_cache.clear()
+
+    cache = _request_cache.get()
+    if cache is None:
+        return
+    if key_id is not None:
+        cache.pop((kind, key_id), None)
+    else:
+        for key in [k for k in cache if k[0] == kind]:
+            del cache[key]
+
 
 # ============ Scenario Operations ============
 
 def create_scenario(title: str, description: str = "", tags: list[str] = None,
                     plot: Plot = None) -> Scenario:
     """Create a new scenario."""
-    tags = tags or []
-    plot = plot or Plot()
-
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO scenarios (title, description, tags, plot, status)
             VALUES (?, ?, ?, ?, ?)
-        """, (title, description, json.dumps(tags), json.dumps(plot.to_dict()), ScenarioStatus.DRAFT.value))
+        """, (
+            title,
+            description,
+            json.dumps(tags) if tags else _EMPTY_LIST_JSON,
+            json.dumps(plot.to_dict()) if plot else _DEFAULT_PLOT_JSON,
+            ScenarioStatus.DRAFT.value
+        ))
 
         scenario_id = cursor.lastrowid
 
@@ -35,7 +101,34 @@ def create_scenario(title: str, description: str = "", tags: list[str] = None,
 
 
 def get_scenario(scenario_id: int) -> Optional[Scenario]:
-    """Get a scenario by ID."""
+    """
+    Get a scenario by ID.
+
+    Served from the request cache first, then the process TTL cache; every
+    scenario or story card write in this module invalidates both.
+    """
+    cache = _request_cache.get()
+    if cache is not None:
+        cached = cache.get(("scenario", scenario_id))
+        if cached:
+            return cached
+
+    ttl_cached = _scenario_cache.get(scenario_id)
+    if ttl_cached and ttl_cached[0] > time.monotonic():
+        scenario = ttl_cached[1]
+    else:
+        scenario = _load_scenario(scenario_id)
+        if scenario is None:
+            return None
+        _scenario_cache[scenario_id] = (time.monotonic() + SCENARIO_CACHE_TTL, scenario)
+
+    if cache is not None:
+        cache[("scenario", scenario_id)] = scenario
+    return scenario
+
+
+def _load_scenario(scenario_id: int) -> Optional[Scenario]:
+    """Read a scenario and its story cards from the database."""
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM scenarios WHERE id = ?", (scenario_id,))
@@ -48,22 +141,9 @@ def get_scenario(scenario_id: int) -> Optional[Scenario]:
         cursor.execute("SELECT * FROM story_cards WHERE scenario_id = ?", (scenario_id,))
         card_rows = cursor.fetchall()
 
-        story_cards = [
-            StoryCard(
-                id=card["id"],
-                scenario_id=card["scenario_id"],
-                type=StoryCardType(card["type"]),
-                name=card["name"],
-                entry=card["entry"],
-                triggers=json.loads(card["triggers"]),
-                notes=card["notes"],
-                created_at=card["created_at"],
-                updated_at=card["updated_at"]
-            )
-            for card in card_rows
-        ]
+        story_cards = [_row_to_story_card(card) for card in card_rows]
 
-        return Scenario(
+        scenario = Scenario(
             id=row["id"],
             title=row["title"],
             description=row["description"],
@@ -75,33 +155,38 @@ def get_scenario(scenario_id: int) -> Optional[Scenario]:
             updated_at=row["updated_at"]
         )
 
+    return scenario
+
 
-def list_scenarios(status: ScenarioStatus = None) -> list[Scenario]:
-    """List all scenarios, optionally filtered by status."""
+def list_scenarios(status: ScenarioStatus = None) -> list[ScenarioSummary]:
+    """List all scenarios, optionally filtered by status.
+
+    Only the listing columns are loaded; use get_scenario for the plot and story cards.
+    """
     with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples, unpacked below
         if status:
-            cursor.execute(
-                "SELECT * FROM scenarios WHERE status = ? ORDER BY updated_at DESC",
-                (status.value,)
-            )
+            cursor.execute("""
+                SELECT id, title, description, status, tags, updated_at FROM scenarios
+                WHERE status = ? ORDER BY updated_at DESC
+            """, (status.value,))
         else:
-            cursor.execute("SELECT * FROM scenarios ORDER BY updated_at DESC")
-
-        rows = cursor.fetchall()
+            cursor.execute("""
+                SELECT id, title, description, status, tags, updated_at FROM scenarios
+                ORDER BY updated_at DESC
+            """)
 
         return [
-            Scenario(
-                id=row["id"],
-                title=row["title"],
-                description=row["description"],
-                tags=json.loads(row["tags"]),
-                status=ScenarioStatus(row["status"]),
-                plot=Plot.from_dict(json.loads(row["plot"])),
-                created_at=row["created_at"],
-                updated_at=row["updated_at"]
+            ScenarioSummary(
+                id=id_,
+                title=title,
+                description=description,
+                status=ScenarioStatus(status_value),
+                tags=json.loads(tags_json),
+                updated_at=updated_at
             )
-            for row in rows
+            for id_, title, description, status_value, tags_json, updated_at in cursor
         ]
 
 
@@ -117,7 +202,7 @@ def update_scenario(scenario_id: int, title: str = None, description: str = None
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE scenarios
-            SET title = ?, description = ?, tags = ?, status = ?, plot = ?, updated_at = ?
+            SET title = ?, description = ?, tags = ?, status = ?, plot = ?
             WHERE id = ?
         """, (
             title if title is not None else scenario.title,
@@ -125,10 +210,10 @@ def update_scenario(scenario_id: int, title: str = None, description: str = None
             json.dumps(tags if tags is not None else scenario.tags),
             (status.value if status else scenario.status.value),
             json.dumps((plot.to_dict() if plot else scenario.plot.to_dict())),
-            datetime.now().isoformat(),
             scenario_id
         ))
 
+    _invalidate("scenario", scenario_id)
     return get_scenario(scenario_id)
 
 
@@ -137,7 +222,10 @@ def delete_scenario(scenario_id: int) -> bool:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+
+    _invalidate("scenario", scenario_id)
+    return deleted
 
 
 # ============ Story Card Operations ============
@@ -145,30 +233,19 @@ def delete_scenario(scenario_id: int) -> bool:
 def create_story_card(scenario_id: int, name: str, type: StoryCardType = StoryCardType.CUSTOM,
                       entry: str = "", triggers: list[str] = None, notes: str = "") -> StoryCard:
     """Create a new story card for a scenario."""
-    triggers = triggers or []
-
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO story_cards (scenario_id, type, name, entry, triggers, notes)
             VALUES (?, ?, ?, ?, ?, ?)
-        """, (scenario_id, type.value, name, entry, json.dumps(triggers), notes))
+        """, (scenario_id, type.value, name, entry, json.dumps(triggers) if triggers else _EMPTY_LIST_JSON, notes))
 
         card_id = cursor.lastrowid
         cursor.execute("SELECT * FROM story_cards WHERE id = ?", (card_id,))
-        row = cursor.fetchone()
+        card = _row_to_story_card(cursor.fetchone())
 
-        return StoryCard(
-            id=row["id"],
-            scenario_id=row["scenario_id"],
-            type=StoryCardType(row["type"]),
-            name=row["name"],
-            entry=row["entry"],
-            triggers=json.loads(row["triggers"]),
-            notes=row["notes"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"]
-        )
+    _invalidate("scenario", scenario_id)
+    return card
 
 
 def get_story_card(card_id: int) -> Optional[StoryCard]:
@@ -181,17 +258,7 @@ def get_story_card(card_id: int) -> Optional[StoryCard]:
         if not row:
             return None
 
-        return StoryCard(
-            id=row["id"],
-            scenario_id=row["scenario_id"],
-            type=StoryCardType(row["type"]),
-            name=row["name"],
-            entry=row["entry"],
-            triggers=json.loads(row["triggers"]),
-            notes=row["notes"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"]
-        )
+        return _row_to_story_card(row)
 
 
 def update_story_card(card_id: int, name: str = None, type: StoryCardType = None,
@@ -205,7 +272,7 @@ def update_story_card(card_id: int, name: str = None, type: StoryCardType = None
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE story_cards
-            SET name = ?, type = ?, entry = ?, triggers = ?, notes = ?, updated_at = ?
+            SET name = ?, type = ?, entry = ?, triggers = ?, notes = ?
             WHERE id = ?
         """, (
             name if name is not None else card.name,
@@ -213,10 +280,10 @@ def update_story_card(card_id: int, name: str = None, type: StoryCardType = None
             entry if entry is not None else card.entry,
             json.dumps(triggers if triggers is not None else card.triggers),
             notes if notes is not None else card.notes,
-            datetime.now().isoformat(),
             card_id
         ))
 
+    _invalidate("scenario", card.scenario_id)
     return get_story_card(card_id)
 
 
@@ -225,7 +292,10 @@ def delete_story_card(card_id: int) -> bool:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM story_cards WHERE id = ?", (card_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+
+    _invalidate("scenario")
+    return deleted
 
 
 def get_triggered_cards(scenario_id: int, text: str) -> list[StoryCard]:
@@ -290,8 +360,19 @@ def create_adventure(scenario_id: int, title: str = None) -> Adventure:
 
 def get_adventure(adventure_id: int) -> Optional[Adventure]:
     """Get an adventure by ID with its event history."""
+    cache = _request_cache.get()
+
     with get_db() as conn:
         cursor = conn.cursor()
+        if cache is not None:
+            cursor.execute("SELECT updated_at FROM adventures WHERE id = ?", (adventure_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            cached = cache.get(("adventure", adventure_id))
+            if cached and cached.updated_at == row["updated_at"]:
+                return cached
+
         cursor.execute("SELECT * FROM adventures WHERE id = ?", (adventure_id,))
         row = cursor.fetchone()
 
@@ -299,38 +380,19 @@ def get_adventure(adventure_id: int) -> Optional[Adventure]:
             return None
 
         # Get events for this adventure
-        cursor.execute(
-            "SELECT * FROM events WHERE adventure_id = ? ORDER BY created_at ASC",
+        event_cursor = conn.cursor()
+        event_cursor.row_factory = None
+        event_cursor.execute(
+            f"SELECT {_EVENT_COLUMNS} FROM events WHERE adventure_id = ? ORDER BY created_at ASC, id ASC",
             (adventure_id,)
         )
-        event_rows = cursor.fetchall()
-
-        events = []
-        for event in event_rows:
-            # Parse character actions
-            char_actions_raw = json.loads(event["character_actions"] or "[]")
-            char_actions = [CharacterAction.from_dict(ca) for ca in char_actions_raw]
-
-            # Parse scene update
-            scene_update = json.loads(event["scene_update"] or "{}") or None
-
-            events.append(Event(
-                id=event["id"],
-                adventure_id=event["adventure_id"],
-                action_type=ActionType(event["action_type"]),
-                actor_name=event["actor_name"] or "",
-                player_input=event["player_input"],
-                narration=event["narration"] or "",
-                character_actions=char_actions,
-                scene_update=scene_update,
-                created_at=event["created_at"]
-            ))
+        events = [_row_to_event(event) for event in event_cursor]
 
         # Parse current scene
         current_scene_data = json.loads(row["current_scene"] or "{}")
         current_scene = Scene.from_dict(current_scene_data) if current_scene_data else None
 
-        return Adventure(
+        adventure = Adventure(
             id=row["id"],
             scenario_id=row["scenario_id"],
             title=row["title"],
@@ -338,42 +400,47 @@ def get_adventure(adventure_id: int) -> Optional[Adventure]:
             memory=row["memory"],
             current_scene=current_scene,
             history=events,
+            context_version=row["context_version"],
             created_at=row["created_at"],
             updated_at=row["updated_at"]
         )
 
+    if cache is not None:
+        cache[("adventure", adventure_id)] = adventure
+    return adventure
+
 
-def list_adventures(scenario_id: int = None) -> list[Adventure]:
-    """List adventures, optionally filtered by scenario."""
+def list_adventures(scenario_id: int = None) -> list[AdventureSummary]:
+    """List adventures, optionally filtered by scenario.
+
+    Only the listing columns are loaded; use get_adventure for the scene and history.
+    """
     with get_db() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples, unpacked below
         if scenario_id:
-            cursor.execute(
-                "SELECT * FROM adventures WHERE scenario_id = ? ORDER BY updated_at DESC",
-                (scenario_id,)
-            )
+            cursor.execute("""
+                SELECT id, scenario_id, title, current_story_summary, memory, created_at, updated_at
+                FROM adventures WHERE scenario_id = ? ORDER BY updated_at DESC
+            """, (scenario_id,))
         else:
-            cursor.execute("SELECT * FROM adventures ORDER BY updated_at DESC")
-
-        rows = cursor.fetchall()
+            cursor.execute("""
+                SELECT id, scenario_id, title, current_story_summary, memory, created_at, updated_at
+                FROM adventures ORDER BY updated_at DESC
+            """)
 
-        adventures = []
-        for row in rows:
-            current_scene_data = json.loads(row["current_scene"] or "{}")
-            current_scene = Scene.from_dict(current_scene_data) if current_scene_data else None
-
-            adventures.append(Adventure(
-                id=row["id"],
-                scenario_id=row["scenario_id"],
-                title=row["title"],
-                current_story_summary=row["current_story_summary"],
-                memory=row["memory"],
-                current_scene=current_scene,
-                created_at=row["created_at"],
-                updated_at=row["updated_at"]
-            ))
-
-        return adventures
+        return [
+            AdventureSummary(
+                id=id_,
+                scenario_id=adv_scenario_id,
+                title=title,
+                current_story_summary=current_story_summary,
+                memory=memory,
+                created_at=created_at,
+                updated_at=updated_at
+            )
+            for id_, adv_scenario_id, title, current_story_summary, memory, created_at, updated_at in cursor
+        ]
 
 
 def update_adventure(adventure_id: int, title: str = None,
@@ -388,17 +455,17 @@ def update_adventure(adventure_id: int, title: str = None,
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE adventures
-            SET title = ?, current_story_summary = ?, memory = ?, current_scene = ?, updated_at = ?
+            SET title = ?, current_story_summary = ?, memory = ?, current_scene = ?
             WHERE id = ?
         """, (
             title if title is not None else adventure.title,
             current_story_summary if current_story_summary is not None else adventure.current_story_summary,
             memory if memory is not None else adventure.memory,
             json.dumps(current_scene.to_dict() if current_scene else (adventure.current_scene.to_dict() if adventure.current_scene else {})),
-            datetime.now().isoformat(),
             adventure_id
         ))
 
+    _invalidate("adventure", adventure_id)
     return get_adventure(adventure_id)
 
 
@@ -407,7 +474,10 @@ def delete_adventure(adventure_id: int) -> bool:
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM adventures WHERE id = ?", (adventure_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+
+    _invalidate("adventure", adventure_id)
+    return deleted
 
 
 # ============ Scene Operations ============
@@ -421,30 +491,75 @@ def update_scene(adventure_id: int, scene: Scene) -> Scene:
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE adventures
-            SET current_scene = ?, updated_at = ?
+            SET current_scene = ?
             WHERE id = ?
         """, (
             json.dumps(scene.to_dict()),
-            datetime.now().isoformat(),
             adventure_id
         ))
 
+    _invalidate("adventure", adventure_id)
     return scene
 
 
 def get_characters_in_scene(adventure_id: int, scenario_id: int) -> dict:
     """Get all characters (PCs and NPCs) currently in the scene."""
-    adventure = get_adventure(adventure_id)
-    scenario = get_scenario(scenario_id)
-
-    if not adventure or not scenario or not adventure.current_scene:
-        return {"pcs": [], "npcs": []}
-
-    present = adventure.current_scene.characters_present
-    pcs = [c for c in scenario.story_cards if c.type == StoryCardType.PLAYING_CHARACTER and c.name in present]
-    npcs = [c for c in scenario.story_cards if c.type == StoryCardType.CHARACTER and c.name in present]
-
-    return {"pcs": pcs, "npcs": npcs}
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT * FROM story_cards
+            WHERE scenario_id = ?
+              AND type IN (?, ?)
+              AND name IN (
+                  SELECT value FROM json_each((
+                      SELECT json_extract(current_scene, '$.characters_present')
+                      FROM adventures WHERE id = ?
+                  ))
+              )
+            ORDER BY id
+        """, (scenario_id, StoryCardType.PLAYING_CHARACTER.value, StoryCardType.CHARACTER.value, adventure_id))
+
+        chars = {"pcs": [], "npcs": []}
+        for row in cursor:
+            card = _row_to_story_card(row)
+            chars["pcs" if card.type == StoryCardType.PLAYING_CHARACTER else "npcs"].append(card)
+
+        return chars
+
+
+def get_scene_chars_with_states(adventure_id: int, scenario_id: int) -> dict:
+    """Get the characters in the scene paired with their states (None if untracked).
+
+    Returns {"pcs": [(card, state)], "npcs": [(card, state)]} from a single query.
+    """
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT sc.*, {_STATE_JOIN_COLUMNS}
+            FROM story_cards sc
+            LEFT JOIN character_states cs
+              ON cs.adventure_id = ? AND cs.character_name = sc.name
+            WHERE sc.scenario_id = ?
+              AND sc.type IN (?, ?)
+              AND sc.name IN (
+                  SELECT value FROM json_each((
+                      SELECT json_extract(current_scene, '$.characters_present')
+                      FROM adventures WHERE id = ?
+                  ))
+              )
+            ORDER BY sc.id
+        """, (adventure_id, scenario_id, StoryCardType.PLAYING_CHARACTER.value,
+              StoryCardType.CHARACTER.value, adventure_id))
+
+        chars = {"pcs": [], "npcs": []}
+        for row in cursor:
+            card = _row_to_story_card(row)
+            state = None
+            if row["cs_id"] is not None:
+                state = _row_to_character_state({c: row[f"cs_{c}"] for c in _STATE_COLUMNS})
+            chars["pcs" if card.type == StoryCardType.PLAYING_CHARACTER else "npcs"].append((card, state))
+
+        return chars
 
 
 def add_character_to_scene(adventure_id: int, character_name: str) -> Scene:
@@ -481,106 +596,137 @@ def add_event(adventure_id: int, action_type: ActionType,
               character_actions: list[CharacterAction] = None,
               scene_update: dict = None) -> Event:
     """Add an event to an adventure's history."""
-    character_actions = character_actions or []
-
+    return apply_turn(adventure_id, event={
+        "action_type": action_type,
+        "player_input": player_input,
+        "narration": narration,
+        "actor_name": actor_name,
+        "character_actions": character_actions,
+        "scene_update": scene_update,
+    })
+
+
+def apply_turn(adventure_id: int, event: dict = None, summary: str = None,
+               mood_updates: dict[str, str] = None) -> Optional[Event]:
+    """
+    Write the end-of-turn changes for an adventure in a single transaction.
+
+    event holds add_event's keyword arguments (action_type and player_input are
+    required); summary replaces the adventure's current_story_summary;
+    mood_updates maps character names to their new current_mood.
+    Returns the inserted event, if any.
+    """
+    new_event = None
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO events (adventure_id, action_type, actor_name, player_input, narration, character_actions, scene_update)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            adventure_id,
-            action_type.value,
-            actor_name,
-            player_input,
-            narration,
-            json.dumps([ca.to_dict() for ca in character_actions]),
-            json.dumps(scene_update or {})
-        ))
-
-        event_id = cursor.lastrowid
-
-        # Update adventure timestamp
-        cursor.execute(
-            "UPDATE adventures SET updated_at = ? WHERE id = ?",
-            (datetime.now().isoformat(), adventure_id)
-        )
-
-        # Apply scene updates if provided
-        if scene_update:
-            adventure = get_adventure(adventure_id)
-            if adventure and adventure.current_scene:
-                scene = adventure.current_scene
-                if "location_name" in scene_update:
-                    scene.location_name = scene_update["location_name"]
-                if "location_description" in scene_update:
-                    scene.location_description = scene_update["location_description"]
-                if "characters_enter" in scene_update:
-                    for char in scene_update["characters_enter"]:
-                        if char not in scene.characters_present:
-                            scene.characters_present.append(char)
-                if "characters_exit" in scene_update:
-                    for char in scene_update["characters_exit"]:
-                        if char in scene.characters_present:
-                            scene.characters_present.remove(char)
-                if "situation" in scene_update:
-                    scene.situation = scene_update["situation"]
-                if "mood" in scene_update:
-                    scene.mood = scene_update["mood"]
-                if "time_of_day" in scene_update:
-                    scene.time_of_day = scene_update["time_of_day"]
-                update_scene(adventure_id, scene)
-
-        cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
-        row = cursor.fetchone()
-
-        char_actions_raw = json.loads(row["character_actions"] or "[]")
-        char_actions = [CharacterAction.from_dict(ca) for ca in char_actions_raw]
-
-        return Event(
-            id=row["id"],
-            adventure_id=row["adventure_id"],
-            action_type=ActionType(row["action_type"]),
-            actor_name=row["actor_name"] or "",
-            player_input=row["player_input"],
-            narration=row["narration"] or "",
-            character_actions=char_actions,
-            scene_update=json.loads(row["scene_update"] or "{}") or None,
-            created_at=row["created_at"]
-        )
+        cursor.row_factory = None
+        # Take the write lock up front so all of the turn's writes commit together
+        cursor.execute("BEGIN IMMEDIATE")
+        if mood_updates:
+            cursor.executemany(
+                "UPDATE character_states SET current_mood = ? WHERE adventure_id = ? AND character_name = ?",
+                [(mood, adventure_id, name) for name, mood in mood_updates.items()]
+            )
+        if event:
+            new_event = _insert_event(cursor, adventure_id, **event)
+        if summary is not None:
+            cursor.execute(
+                "UPDATE adventures SET current_story_summary = ? WHERE id = ?",
+                (summary, adventure_id)
+            )
 
+    _invalidate("adventure", adventure_id)
+    return new_event
+
+
+def _insert_event(cursor, adventure_id: int, action_type: ActionType,
+                  player_input: str, narration: str = "",
+                  actor_name: str = "",
+                  character_actions: list[CharacterAction] = None,
+                  scene_update: dict = None) -> Event:
+    """Insert an event and apply its scene update, inside the caller's transaction."""
+    cursor.execute(f"""
+        INSERT INTO events (adventure_id, action_type, actor_name, player_input, narration, character_actions, scene_update)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        RETURNING {_EVENT_COLUMNS}
+    """, (
+        adventure_id,
+        action_type.value,
+        actor_name,
+        player_input,
+        narration,
+        _dumps_json([ca.to_dict() for ca in character_actions]) if character_actions else _EMPTY_LIST_JSON,
+        _dumps_json(scene_update) if scene_update else _EMPTY_DICT_JSON
+    ))
+    event = _row_to_event(cursor.fetchone())
+
+    # Apply scene updates by setting just the changed fields (json_set keeps
+    # explicit nulls, which json_patch would treat as deletions)
+    scene_fields = {}
+    if scene_update:
+        scene_fields = {
+            key: scene_update[key]
+            for key in ("location_name", "location_description", "situation", "mood", "time_of_day")
+            if key in scene_update
+        }
+        if "characters_enter" in scene_update or "characters_exit" in scene_update:
+            cursor.execute(
+                "SELECT json_extract(current_scene, '$.characters_present') FROM adventures WHERE id = ?",
+                (adventure_id,)
+            )
+            row = cursor.fetchone()
+            present = json.loads(row[0]) if row and row[0] else []
+            for char in scene_update.get("characters_enter", []):
+                if char not in present:
+                    present.append(char)
+            exiting = set(scene_update.get("characters_exit", []))
+            scene_fields["characters_present"] = [c for c in present if c not in exiting]
+
+    # One UPDATE sets the scene fields (if there is a scene) and touches the adventure timestamp
+    set_args = "".join(f", '$.{key}', json(?)" for key in scene_fields)
+    cursor.execute(f"""
+        UPDATE adventures
+        SET current_scene = COALESCE(json_set(NULLIF(current_scene, '{{}}'){set_args}), current_scene)
+        WHERE id = ?
+    """, (*(json.dumps(value) for value in scene_fields.values()), adventure_id))
+
+    return event
+
+
+def iter_recent_events(adventure_id: int, limit: int = 10,
+                       snippet_len: Optional[int] = None) -> Iterator[Event]:
+    """
+    Yield the most recent events for an adventure in chronological order, parsing rows lazily.
+
+    If snippet_len is given, narration is truncated to that many characters by SQLite.
+    """
+    if snippet_len is None:
+        columns, params = _EVENT_COLUMNS, (adventure_id, limit)
+    else:
+        columns, params = _EVENT_SNIPPET_COLUMNS, (snippet_len, adventure_id, limit)
 
-def get_recent_events(adventure_id: int, limit: int = 10) -> list[Event]:
-    """Get the most recent events for an adventure."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM events
-            WHERE adventure_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (adventure_id, limit))
-
-        rows = cursor.fetchall()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT {columns} FROM events
+            WHERE id IN (
+                SELECT id FROM events
+                WHERE adventure_id = ?
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            )
+            ORDER BY created_at ASC, id ASC
+        """, params)
 
-        events = []
-        for row in reversed(rows):  # Reverse to get chronological order
-            char_actions_raw = json.loads(row["character_actions"] or "[]")
-            char_actions = [CharacterAction.from_dict(ca) for ca in char_actions_raw]
+        for row in cursor:
+            yield _row_to_event(row)
 
-            events.append(Event(
-                id=row["id"],
-                adventure_id=row["adventure_id"],
-                action_type=ActionType(row["action_type"]),
-                actor_name=row["actor_name"] or "",
-                player_input=row["player_input"],
-                narration=row["narration"] or "",
-                character_actions=char_actions,
-                scene_update=json.loads(row["scene_update"] or "{}") or None,
-                created_at=row["created_at"]
-            ))
 
-        return events
+def get_recent_events(adventure_id: int, limit: int = 10,
+                      snippet_len: Optional[int] = None) -> list[Event]:
+    """Get the most recent events for an adventure, in chronological order."""
+    return list(iter_recent_events(adventure_id, limit, snippet_len))
 
 
 def undo_last_event(adventure_id: int) -> bool:
@@ -592,11 +738,14 @@ def undo_last_event(adventure_id: int) -> bool:
             WHERE id = (
                 SELECT id FROM events
                 WHERE adventure_id = ?
-                ORDER BY created_at DESC
+                ORDER BY created_at DESC, id DESC
                 LIMIT 1
             )
         """, (adventure_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+
+    _invalidate("adventure", adventure_id)
+    return deleted
 
 
 # ============ Character State Operations ============
@@ -623,12 +772,12 @@ def create_character_state(adventure_id: int, character_name: str,
             character_name,
             character_card_id,
             1 if is_pc else 0,
-            json.dumps(personality_traits or []),
-            json.dumps(values or []),
-            json.dumps(fears or []),
+            _dumps_json(personality_traits) if personality_traits else _EMPTY_LIST_JSON,
+            _dumps_json(values) if values else _EMPTY_LIST_JSON,
+            _dumps_json(fears) if fears else _EMPTY_LIST_JSON,
             speech_style,
-            json.dumps(inventory or []),
-            json.dumps(stats or {})
+            _dumps_json(inventory) if inventory else _EMPTY_LIST_JSON,
+            _dumps_json(stats) if stats else _EMPTY_DICT_JSON
         ))
 
         state_id = cursor.lastrowid
@@ -689,17 +838,17 @@ def update_character_state(state_id: int, **kwargs) -> Optional[CharacterState]:
     values = []
 
     field_mappings = {
-        "personality_traits": (json.dumps, "personality_traits"),
-        "values": (json.dumps, "char_values"),
-        "fears": (json.dumps, "fears"),
+        "personality_traits": (_dumps_json, "personality_traits"),
+        "values": (_dumps_json, "char_values"),
+        "fears": (_dumps_json, "fears"),
         "speech_style": (str, "speech_style"),
         "current_mood": (str, "current_mood"),
         "current_goal": (str, "current_goal"),
-        "long_term_goals": (json.dumps, "long_term_goals"),
-        "inventory": (json.dumps, "inventory"),
-        "equipped": (json.dumps, "equipped"),
-        "relationships": (json.dumps, "relationships"),
-        "stats": (json.dumps, "stats"),
+        "long_term_goals": (_dumps_json, "long_term_goals"),
+        "inventory": (_dumps_json, "inventory"),
+        "equipped": (_dumps_json, "equipped"),
+        "relationships": (_dumps_json, "relationships"),
+        "stats": (_dumps_json, "stats"),
         "recent_actions_summary": (str, "recent_actions_summary")
     }
 
@@ -711,8 +860,6 @@ def update_character_state(state_id: int, **kwargs) -> Optional[CharacterState]:
     if not updates:
         return state
 
-    updates.append("updated_at = ?")
-    values.append(datetime.now().isoformat())
     values.append(state_id)
 
     with get_db() as conn:
@@ -743,13 +890,30 @@ def update_character_goal(adventure_id: int, character_name: str, goal: str) ->
 
 def add_item_to_character(adventure_id: int, character_name: str,
                           item_name: str, description: str = "", quantity: int = 1) -> Optional[CharacterState]:
-    """Add an item to a character's inventory."""
-    state = get_character_state_by_name(adventure_id, character_name)
-    if not state:
-        return None
+    """Add an item to a character's inventory.
+
+    Stacks onto an existing item of the same name, otherwise appends a new entry.
+    """
+    item_json = json.dumps({"name": item_name, "description": description, "quantity": quantity})
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE character_states
+            SET inventory = COALESCE(
+                (SELECT json_set(inventory, '$[' || key || '].quantity',
+                                 COALESCE(json_extract(value, '$.quantity'), 1) + ?)
+                 FROM json_each(inventory)
+                 WHERE json_extract(value, '$.name') = ?
+                 LIMIT 1),
+                json_insert(inventory, '$[#]', json(?))
+            )
+            WHERE adventure_id = ? AND character_name = ?
+            RETURNING *
+        """, (quantity, item_name, item_json, adventure_id, character_name))
+        row = cursor.fetchone()
 
-    state.add_item(item_name, description, quantity)
-    return update_character_state(state.id, inventory=state.inventory)
+    return _row_to_character_state(row) if row else None
 
 
 def remove_item_from_character(adventure_id: int, character_name: str,
@@ -767,39 +931,36 @@ def remove_item_from_character(adventure_id: int, character_name: str,
 def update_character_relationship(adventure_id: int, character_name: str,
                                    target_name: str, attitude: str, notes: str = "") -> Optional[CharacterState]:
     """Update a character's relationship with another character."""
-    state = get_character_state_by_name(adventure_id, character_name)
-    if not state:
-        return None
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE character_states
+            SET relationships = json_patch(relationships, json_object(?, json_object('attitude', ?, 'notes', ?)))
+            WHERE adventure_id = ? AND character_name = ?
+            RETURNING *
+        """, (target_name, attitude, notes, adventure_id, character_name))
+        row = cursor.fetchone()
 
-    state.relationships[target_name] = {"attitude": attitude, "notes": notes}
-    return update_character_state(state.id, relationships=state.relationships)
+    return _row_to_character_state(row) if row else None
 
 
 def get_character_action_history(adventure_id: int, character_name: str, limit: int = 20) -> list[CharacterAction]:
-    """Get recent actions taken by a specific character."""
+    """Get the most recent actions taken by a specific character, in chronological order."""
     with get_db() as conn:
         cursor = conn.cursor()
         cursor.execute("""
-            SELECT character_actions FROM events
-            WHERE adventure_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (adventure_id, limit * 2))  # Fetch more to find enough for this character
-
-        rows = cursor.fetchall()
-
-        actions = []
-        for row in reversed(rows):
-            char_actions = json.loads(row["character_actions"] or "[]")
-            for ca in char_actions:
-                if ca.get("character_name") == character_name:
-                    actions.append(CharacterAction.from_dict(ca))
-                    if len(actions) >= limit:
-                        break
-            if len(actions) >= limit:
-                break
+            SELECT action FROM (
+                SELECT ca.value AS action, e.created_at, e.id AS event_id, ca.key AS position
+                FROM events e, json_each(e.character_actions) ca
+                WHERE e.adventure_id = ?
+                  AND json_extract(ca.value, '$.character_name') = ?
+                ORDER BY e.created_at DESC, e.id DESC, ca.key DESC
+                LIMIT ?
+            )
+            ORDER BY created_at ASC, event_id ASC, position ASC
+        """, (adventure_id, character_name, limit))
 
-        return actions
+        return [CharacterAction.from_dict(json.loads(row["action"])) for row in cursor]
 
 
 def initialize_character_states_for_adventure(adventure_id: int, scenario_id: int) -> list[CharacterState]:
@@ -830,6 +991,45 @@ def initialize_character_states_for_adventure(adventure_id: int, scenario_id: in
     return states
 
 
+# ============ Async Wrappers ============
+# SQLite access is blocking; these let async callers overlap independent lookups.
+
+async def aget_adventure(adventure_id: int) -> Optional[Adventure]:
+    """Run get_adventure() on a worker thread."""
+    return await asyncio.to_thread(get_adventure, adventure_id)
+
+
+async def aget_scenario(scenario_id: int) -> Optional[Scenario]:
+    """Run get_scenario() on a worker thread."""
+    return await asyncio.to_thread(get_scenario, scenario_id)
+
+
+async def aget_scene_chars_with_states(adventure_id: int, scenario_id: int) -> dict:
+    """Run get_scene_chars_with_states() on a worker thread."""
+    return await asyncio.to_thread(get_scene_chars_with_states, adventure_id, scenario_id)
+
+
+async def aget_recent_events(adventure_id: int, limit: int = 10,
+                             snippet_len: Optional[int] = None) -> list[Event]:
+    """Run get_recent_events() on a worker thread."""
+    return await asyncio.to_thread(get_recent_events, adventure_id, limit, snippet_len)
+
+
+def _dumps_json(value) -> str:
+    """Serialize a value for a JSON TEXT column (kept as str so SQLite's JSON1 functions still apply)."""
+    return orjson.dumps(value).decode()
+
+
+def _loads_list(value) -> list:
+    """Parse a JSON array column, treating NULL/empty as []."""
+    return orjson.loads(value) if value else []
+
+
+def _loads_dict(value) -> dict:
+    """Parse a JSON object column, treating NULL/empty as {}."""
+    return orjson.loads(value) if value else {}
+
+
 def _row_to_character_state(row) -> CharacterState:
     """Convert a database row to a CharacterState object."""
     return CharacterState(
@@ -838,18 +1038,51 @@ def _row_to_character_state(row) -> CharacterState:
         character_name=row["character_name"],
         character_card_id=row["character_card_id"],
         is_pc=bool(row["is_pc"]),
-        personality_traits=json.loads(row["personality_traits"] or "[]"),
-        values=json.loads(row["char_values"] or "[]"),
-        fears=json.loads(row["fears"] or "[]"),
+        personality_traits=_loads_list(row["personality_traits"]),
+        values=_loads_list(row["char_values"]),
+        fears=_loads_list(row["fears"]),
         speech_style=row["speech_style"] or "",
         current_mood=row["current_mood"] or "",
         current_goal=row["current_goal"] or "",
-        long_term_goals=json.loads(row["long_term_goals"] or "[]"),
-        inventory=json.loads(row["inventory"] or "[]"),
-        equipped=json.loads(row["equipped"] or "[]"),
-        relationships=json.loads(row["relationships"] or "{}"),
-        stats=json.loads(row["stats"] or "{}"),
+        long_term_goals=_loads_list(row["long_term_goals"]),
+        inventory=_loads_list(row["inventory"]),
+        equipped=_loads_list(row["equipped"]),
+        relationships=_loads_dict(row["relationships"]),
+        stats=_loads_dict(row["stats"]),
         recent_actions_summary=row["recent_actions_summary"] or "",
         created_at=row["created_at"],
         updated_at=row["updated_at"]
     )
+
+
+def _row_to_story_card(row) -> StoryCard:
+    """Convert a database row to a StoryCard object."""
+    return StoryCard(
+        id=row["id"],
+        scenario_id=row["scenario_id"],
+        type=StoryCardType(row["type"]),
+        name=row["name"],
+        entry=row["entry"],
+        triggers=json.loads(row["triggers"]),
+        notes=row["notes"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"]
+    )
+
+
+def _row_to_event(row: tuple) -> Event:
+    """Convert an events row selected as _EVENT_COLUMNS to an Event object."""
+    (event_id, adventure_id, action_type, actor_name, player_input,
+     narration, character_actions, scene_update, created_at) = row
+
+    return Event(
+        id=event_id,
+        adventure_id=adventure_id,
+        action_type=ActionType(action_type),
+        actor_name=actor_name or "",
+        player_input=player_input,
+        narration=narration or "",
+        character_actions=[CharacterAction.from_dict(ca) for ca in _loads_list(character_actions)],
+        scene_update=_loads_dict(scene_update) or None,
+        created_at=created_at
+    )
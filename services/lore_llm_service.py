@@ -5,11 +5,20 @@ Two LLM roles:
 1. Story Orchestrator - manages plot, narration, determines who responds
 2. Character Voice - generates individual character dialogue/actions
 """
-import json
+import asyncio
+import functools
+import itertools
+import logging
+import os
 import re
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Optional
-from litellm import completion
+from typing import AsyncIterator, Optional, Sequence
+
+import httpx
+import litellm
+import orjson
+from litellm import acompletion
 
 from models.lore import (
     ActionType, Adventure, StoryCard, Scenario, Plot,
@@ -17,6 +26,8 @@ from models.lore import (
 )
 from services import lore_db_service as db
 
+logger = logging.getLogger(__name__)
+
 # Lore-specific LLM settings
 lore_settings = {
     "api_base": "http://localhost:8080/v1",
@@ -24,30 +35,141 @@ lore_settings = {
     "character_model": "gemma-2-9b",  # Model for character voices
 }
 
+# Shared connection pool for async LiteLLM calls, so requests to the model server reuse keep-alive connections.
+# Opened and closed with the app lifespan (see open_http_client / close_http_client).
+_http_client: Optional[httpx.AsyncClient] = None
+
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
+# Prompt files are read once per process; set LORE_PROMPT_CACHE=0 to re-read on every call while editing them
+PROMPT_CACHE_ENABLED = os.getenv("LORE_PROMPT_CACHE", "1") != "0"
+
+# Estimated token budget for the story context; recent events are dropped oldest-first to stay under it
+CONTEXT_BUDGET_TOKENS = int(os.getenv("LORE_CONTEXT_BUDGET", "2000"))
+# Newest recent-event lines considered for the context before the token budget applies
+HISTORY_MAX_LINES = 10
+# Longest story summary (in characters) included in the context
+SUMMARY_CONTEXT_MAX_CHARS = 2000
 
-def _load_prompt(filename: str) -> str:
-    """Load a prompt template from the prompts directory."""
+
+def _read_prompt(filename: str) -> str:
+    """Read a prompt template from the prompts directory."""
     prompt_path = PROMPTS_DIR / filename
     if prompt_path.exists():
         return prompt_path.read_text()
     return ""
 
 
-def _get_llm_kwargs(model_type: str = "story") -> dict:
-    """Get LLM kwargs based on model type."""
-    model = lore_settings["story_model"] if model_type == "story" else lore_settings["character_model"]
-    kwargs = {"model": model}
+_load_prompt = functools.lru_cache(maxsize=None)(_read_prompt) if PROMPT_CACHE_ENABLED else _read_prompt
+
+_PRELOADED_PROMPTS = ("story_orchestrator.md", "character_response.md", "character_responses_batch.md",
+                      "story_director.md", "npc_creation.md")
+
+if PROMPT_CACHE_ENABLED:
+    for _prompt_file in _PRELOADED_PROMPTS:
+        _load_prompt(_prompt_file)
+
+
+def reload_prompts() -> list[str]:
+    """Drop cached prompt templates and re-read them from disk. Returns the reloaded files."""
+    if not PROMPT_CACHE_ENABLED:
+        return []
+    _load_prompt.cache_clear()
+    for prompt_file in _PRELOADED_PROMPTS:
+        _load_prompt(prompt_file)
+    return list(_PRELOADED_PROMPTS)
+
+
+# Base completion kwargs per model type, rebuilt after update_lore_settings
+_kwargs_cache: dict[str, dict] = {}
+
+
+def _refresh_llm_kwargs():
+    """Rebuild the base kwargs for both model types from lore_settings."""
+    for model_type, setting in (("story", "story_model"), ("character", "character_model")):
+        base = {"model": lore_settings[setting]}
 
-    if lore_settings["api_base"]:
-        kwargs["api_base"] = lore_settings["api_base"]
-        kwargs["custom_llm_provider"] = "openai"
-        kwargs["api_key"] = "dummy"
+        if lore_settings["api_base"]:
+            base["api_base"] = lore_settings["api_base"]
+            base["custom_llm_provider"] = "openai"
+            base["api_key"] = "dummy"
+
+        _kwargs_cache[model_type] = base
+
+
+_refresh_llm_kwargs()
+
+
+def _get_llm_kwargs(model_type: str = "story", *, max_tokens: int = None,
+                    temperature: float = None, json_mode: bool = False) -> dict:
+    """
+    Get LLM kwargs based on model type, with optional output cap and temperature.
+
+    json_mode asks the server to constrain decoding to a single JSON object.
+    """
+    base = _kwargs_cache["story" if model_type == "story" else "character"]
+
+    kwargs = base.copy()
+    if "api_base" in kwargs:
+        # llama.cpp server: keep the KV cache of the shared prompt prefix between requests.
+        # Built per call so no request shares (or mutates) another's extra_body.
+        kwargs["extra_body"] = {"cache_prompt": True}
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
 
     return kwargs
 
 
+# Output caps per call type. Decode time grows with output length, but the
+# orchestrator and character calls must leave room for a complete JSON object.
+OPENING_MAX_TOKENS = 600
+ORCHESTRATOR_MAX_TOKENS = 500
+CHARACTER_MAX_TOKENS = 250
+NPC_CREATION_MAX_TOKENS = 600
+SUMMARY_MAX_TOKENS = 450
+
+# Two or more responding NPCs share one Character Voice call
+BATCH_VOICE_MIN_RESPONDERS = 2
+
+# Streamed turns end with this ASCII record separator, then the turn result as JSON
+STREAM_RESULT_SEPARATOR = "\n\x1e"
+
+# Built story contexts (and the scene characters they list), keyed by adventure id and
+# its context_version; the database bumps that version on every relevant write, so
+# entries never go stale, even when another process did the writing
+CONTEXT_CACHE_MAX = 64
+_context_cache: OrderedDict[tuple[int, int], tuple[str, dict]] = OrderedDict()
+
+
+async def _complete(kwargs: dict) -> str:
+    """Run a completion and return the response text."""
+    response = await acompletion(**kwargs)
+    return response.choices[0].message.content
+
+
+def open_http_client():
+    """Create the shared LiteLLM connection pool (called on app startup)."""
+    global _http_client
+    _http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=httpx.Timeout(120.0),
+    )
+    litellm.aclient_session = _http_client
+
+
+async def close_http_client():
+    """Close the shared LiteLLM connection pool (called on app shutdown)."""
+    global _http_client
+    client, _http_client = _http_client, None
+    litellm.aclient_session = None
+    if client is not None:
+        await client.aclose()
+
+
 def update_lore_settings(story_model: str = None, character_model: str = None,
                          api_base: str = None) -> dict:
     """Update lore LLM settings."""
@@ -57,6 +179,7 @@ def update_lore_settings(story_model: str = None, character_model: str = None,
         lore_settings["character_model"] = character_model
     if api_base is not None:
         lore_settings["api_base"] = api_base
+    _refresh_llm_kwargs()
     return lore_settings
 
 
@@ -65,131 +188,254 @@ def get_lore_settings() -> dict:
     return lore_settings.copy()
 
 
+# Patterns for pulling JSON out of free-form LLM output
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+
+
+def _find_balanced_json(text: str, start: int = 0) -> Optional[tuple[int, int]]:
+    """
+    Find the first balanced {...} block at or after start in a single linear scan.
+
+    Braces inside JSON strings (including escaped quotes) are ignored. Returns
+    the (start, end) slice bounds, or None if no block closes.
+    """
+    begin = text.find("{", start)
+    if begin < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(begin, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, i + 1
+    return None
+
+
 def _extract_json(text: str) -> dict:
     """Extract JSON from LLM response, handling markdown code blocks."""
-    # Try to find JSON in code blocks first
-    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
+    # Fast path: the response is a bare JSON object
+    starts_with_brace = text.lstrip().startswith("{")
+    if starts_with_brace:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+
+    # Try to find JSON in code blocks
+    json_match = _JSON_FENCE_RE.search(text)
     if json_match:
         try:
-            return json.loads(json_match.group(1))
-        except json.JSONDecodeError:
+            return orjson.loads(json_match.group(1))
+        except orjson.JSONDecodeError:
             pass
 
     # Try parsing the entire response as JSON
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # Try to find JSON object in text
-    brace_match = re.search(r'\{[\s\S]*\}', text)
-    if brace_match:
+    if not starts_with_brace:
         try:
-            return json.loads(brace_match.group(0))
-        except json.JSONDecodeError:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
             pass
 
+    # Try each balanced JSON object in the text, resuming after any that fail to parse
+    bounds = _find_balanced_json(text)
+    while bounds:
+        try:
+            return orjson.loads(text[bounds[0]:bounds[1]])
+        except orjson.JSONDecodeError:
+            bounds = _find_balanced_json(text, bounds[1])
+
     return {}
 
 
-def _build_context(adventure: Adventure, scenario: Scenario) -> str:
-    """Build the context string for story generation."""
+# Story context section headers
+_HDR_PLOT = "## Plot Essentials\n"
+_HDR_AI_INSTRUCTIONS = "## AI Instructions\n"
+_HDR_AUTHORS_NOTE = "## Author's Note\n"
+_HDR_SCENE = "## Current Scene\n"
+_HDR_PCS = "## Playing Characters Present\n"
+_HDR_NPCS = "## NPCs Present\n"
+_HDR_SUMMARY = "## Story Summary\n"
+_HDR_RECENT = "## Recent Events\n"
+
+# ActionType -> value, so the history loop doesn't go through the Enum.value descriptor per event
+_ACTION_VAL = {a: a.value for a in ActionType}
+
+
+@functools.lru_cache(maxsize=64)
+def _build_static_prefix(plot_essentials: str, ai_instructions: str, authors_note: str) -> str:
+    """Build the scenario-level context that stays identical from turn to turn."""
+    prefix_parts = []
+
+    # Plot essentials
+    if plot_essentials:
+        prefix_parts.append(_HDR_PLOT + plot_essentials)
+
+    # AI instructions
+    if ai_instructions:
+        prefix_parts.append(_HDR_AI_INSTRUCTIONS + ai_instructions)
+
+    # Author's note
+    if authors_note:
+        prefix_parts.append(_HDR_AUTHORS_NOTE + authors_note)
+
+    return "\n\n".join(prefix_parts)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """Cut text to at most max_chars, at a word boundary where possible."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    if space > 0:
+        cut = cut[:space]
+    return cut.rstrip() + "..."
+
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token) that needs no tokenizer."""
+    return len(text) // 4 + 1
+
+
+def _fit_context(parts: list[str], history_parts: Sequence[str], budget_tokens: int,
+                 min_lines: int = 0) -> str:
+    """
+    Join the context parts, then append as many of the newest history lines as
+    fit within budget_tokens. The non-history parts and the newest min_lines
+    history lines are always kept.
+    """
+    used = _estimate_tokens("\n\n".join(parts))
+
+    kept = []
+    for line in reversed(history_parts):
+        used += _estimate_tokens(line)
+        if used > budget_tokens and len(kept) >= min_lines:
+            break
+        kept.append(line)
+
+    if kept:
+        kept.reverse()
+        parts = parts + [_HDR_RECENT + "\n".join(kept)]
+    return "\n\n".join(parts)
+
+
+def _build_context(adventure: Adventure, scenario: Scenario,
+                   scene_chars: dict = None,
+                   recent_events: list = None) -> str:
+    """Build the context string for story generation.
+
+    Scenario-level sections come first so the prompt prefix is byte-identical
+    across turns and can be reused by the inference server's prompt cache.
+    Scene characters with their states and recent events are loaded here
+    unless the caller has already fetched them (events with snippet_len=150).
+    """
     context_parts = []
 
+    static_prefix = _build_static_prefix(
+        scenario.plot.plot_essentials, scenario.plot.ai_instructions, scenario.plot.authors_note
+    )
+    if static_prefix:
+        context_parts.append(static_prefix)
+
     # Current scene
     if adventure.current_scene:
-        context_parts.append(f"## Current Scene\n{adventure.current_scene.describe()}")
-
-    # Get all character states for this adventure
-    character_states = db.list_character_states(adventure.id)
-    state_map = {cs.character_name: cs for cs in character_states}
+        context_parts.append(_HDR_SCENE + adventure.current_scene.describe())
 
     # Characters info with states
-    chars = db.get_characters_in_scene(adventure.id, scenario.id)
-    if chars["pcs"]:
+    if scene_chars is None:
+        scene_chars = db.get_scene_chars_with_states(adventure.id, scenario.id)
+    if scene_chars["pcs"]:
         pc_lines = []
-        for c in chars["pcs"]:
-            state = state_map.get(c.name)
-            line = f"- **{c.name}** (PC): {c.entry}"
+        for c, state in scene_chars["pcs"]:
+            parts = [f"- **{c.name}** (PC): {c.entry}"]
             if state:
                 personality = state.describe_personality()
                 current = state.describe_state()
                 if personality:
-                    line += f"\n  Personality: {personality}"
+                    parts.append(f"  Personality: {personality}")
                 if current:
-                    line += f"\n  Current: {current}"
+                    parts.append(f"  Current: {current}")
                 if state.inventory:
-                    items = [f"{i['name']} x{i.get('quantity', 1)}" for i in state.inventory[:5]]
-                    line += f"\n  Inventory: {', '.join(items)}"
-            pc_lines.append(line)
-        context_parts.append(f"## Playing Characters Present\n" + "\n".join(pc_lines))
+                    items = ", ".join(f"{i['name']} x{i.get('quantity', 1)}" for i in itertools.islice(state.inventory, 5))
+                    parts.append(f"  Inventory: {items}")
+            pc_lines.append("\n".join(parts))
+        context_parts.append(_HDR_PCS + "\n".join(pc_lines))
 
-    if chars["npcs"]:
+    if scene_chars["npcs"]:
         npc_lines = []
-        for c in chars["npcs"]:
-            state = state_map.get(c.name)
-            line = f"- **{c.name}** (NPC): {c.entry}"
+        for c, state in scene_chars["npcs"]:
+            parts = [f"- **{c.name}** (NPC): {c.entry}"]
             if state:
                 personality = state.describe_personality()
                 current = state.describe_state()
                 if personality:
-                    line += f"\n  Personality: {personality}"
+                    parts.append(f"  Personality: {personality}")
                 if current:
-                    line += f"\n  Current: {current}"
+                    parts.append(f"  Current: {current}")
                 if state.relationships:
-                    rel_str = ", ".join([f"{k}: {v.get('attitude', 'neutral')}" for k, v in list(state.relationships.items())[:3]])
-                    line += f"\n  Relationships: {rel_str}"
-            npc_lines.append(line)
-        context_parts.append(f"## NPCs Present\n" + "\n".join(npc_lines))
-
-    # Plot essentials
-    if scenario.plot.plot_essentials:
-        context_parts.append(f"## Plot Essentials\n{scenario.plot.plot_essentials}")
+                    rel_str = ", ".join(f"{k}: {v.get('attitude', 'neutral')}" for k, v in itertools.islice(state.relationships.items(), 3))
+                    parts.append(f"  Relationships: {rel_str}")
+            npc_lines.append("\n".join(parts))
+        context_parts.append(_HDR_NPCS + "\n".join(npc_lines))
 
     # Story summary
     if adventure.current_story_summary:
-        context_parts.append(f"## Story Summary\n{adventure.current_story_summary}")
-
-    # AI instructions
-    if scenario.plot.ai_instructions:
-        context_parts.append(f"## AI Instructions\n{scenario.plot.ai_instructions}")
-
-    # Author's note
-    if scenario.plot.authors_note:
-        context_parts.append(f"## Author's Note\n{scenario.plot.authors_note}")
+        context_parts.append(_HDR_SUMMARY + _truncate(adventure.current_story_summary, SUMMARY_CONTEXT_MAX_CHARS))
 
     # Recent history
-    recent_events = db.get_recent_events(adventure.id, limit=5)
-    if recent_events:
-        history_parts = []
-        for event in recent_events:
-            if event.actor_name:
-                history_parts.append(f"**{event.actor_name}** ({event.action_type.value}): {event.player_input}")
-            if event.narration:
-                history_parts.append(f"*{event.narration[:150]}*")
-            for ca in event.character_actions:
-                if ca.speech:
-                    history_parts.append(f"**{ca.character_name}**: \"{ca.speech}\"")
-                if ca.action:
-                    history_parts.append(f"*{ca.character_name} {ca.action}*")
-        if history_parts:
-            context_parts.append(f"## Recent Events\n" + "\n".join(history_parts[-10:]))
-
-    return "\n\n".join(context_parts)
+    if recent_events is None:
+        recent_events = db.iter_recent_events(adventure.id, limit=5, snippet_len=150)
+    history_parts = deque(maxlen=HISTORY_MAX_LINES)
+    newest_lines = 0
+    for event in recent_events:
+        lines = []
+        if event.actor_name:
+            lines.append(f"**{event.actor_name}** ({_ACTION_VAL[event.action_type]}): {event.player_input}")
+        if event.narration:
+            lines.append(f"*{event.narration}*")
+        for ca in event.character_actions:
+            if ca.speech:
+                lines.append(f"**{ca.character_name}**: \"{ca.speech}\"")
+            if ca.action:
+                lines.append(f"*{ca.character_name} {ca.action}*")
+        if lines:
+            history_parts.extend(lines)
+            newest_lines = min(len(lines), HISTORY_MAX_LINES)
+
+    # The newest event always stays, even if the static sections use up the budget
+    return _fit_context(context_parts, history_parts, CONTEXT_BUDGET_TOKENS, newest_lines)
+
+
+# How the current action is introduced to the orchestrator; {actor} is the acting character
+_ACTION_PREFIX = {
+    ActionType.DO: "{actor} attempts to",
+    ActionType.SAY: "{actor} says:",
+    ActionType.STORY: "Narration:",
+    ActionType.DO_SAY: "{actor}"
+}
 
 
-async def _call_story_orchestrator(context: str, player_action: str,
-                                   actor_name: str, action_type: ActionType) -> dict:
-    """Call the Story Orchestrator LLM to determine what happens."""
+def _build_orchestrator_kwargs(context: str, player_action: str,
+                               actor_name: str, action_type: ActionType) -> dict:
+    """Build the Story Orchestrator request for the current action."""
     system_prompt = _load_prompt("story_orchestrator.md")
 
-    action_prefix = {
-        ActionType.DO: f"{actor_name} attempts to",
-        ActionType.SAY: f"{actor_name} says:",
-        ActionType.STORY: "Narration:",
-        ActionType.DO_SAY: f"{actor_name}"
-    }
-    prefix = action_prefix.get(action_type, actor_name)
+    prefix = _ACTION_PREFIX.get(action_type, "{actor}").format(actor=actor_name)
     formatted_action = f"{prefix} {player_action}"
 
     user_message = f"""{context}
@@ -203,15 +449,16 @@ Respond with the JSON structure as specified. Remember:
 - Update scene state if anything changed
 - Never write dialogue for any character"""
 
-    kwargs = _get_llm_kwargs("story")
+    kwargs = _get_llm_kwargs("story", max_tokens=ORCHESTRATOR_MAX_TOKENS, temperature=0.8, json_mode=True)
     kwargs["messages"] = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message}
     ]
+    return kwargs
 
-    response = completion(**kwargs)
-    response_text = response.choices[0].message.content
 
+def _parse_orchestrator_result(response_text: str) -> dict:
+    """Parse a complete Story Orchestrator response, filling in missing fields."""
     result = _extract_json(response_text)
 
     # Ensure required fields exist
@@ -229,38 +476,62 @@ Respond with the JSON structure as specified. Remember:
     return result
 
 
-async def _call_character_voice(character: StoryCard, context: str,
-                                response_context: str, mood: str = "",
-                                adventure_id: int = None) -> CharacterAction:
-    """Call the Character Voice LLM for a specific NPC."""
+async def _call_story_orchestrator(context: str, player_action: str,
+                                   actor_name: str, action_type: ActionType) -> dict:
+    """Call the Story Orchestrator LLM to determine what happens."""
+    kwargs = _build_orchestrator_kwargs(context, player_action, actor_name, action_type)
+    return _parse_orchestrator_result(await _complete(kwargs))
+
+
+def _describe_character_state(adventure_id: int, name: str,
+                              char_state: Optional[CharacterState] = None,
+                              state_loaded: bool = False) -> str:
+    """
+    Summarize a character's tracked state for a Character Voice prompt.
+
+    The state is looked up by name unless the caller passes it, or sets
+    state_loaded to say a None char_state means the character has none.
+    """
+    if char_state is None and not state_loaded and adventure_id:
+        char_state = db.get_character_state_by_name(adventure_id, name)
+    if not char_state:
+        return ""
+
+    state_parts = []
+    if char_state.personality_traits:
+        state_parts.append(f"Personality: {', '.join(char_state.personality_traits)}")
+    if char_state.values:
+        state_parts.append(f"Values: {', '.join(char_state.values)}")
+    if char_state.fears:
+        state_parts.append(f"Fears: {', '.join(char_state.fears)}")
+    if char_state.speech_style:
+        state_parts.append(f"Speech style: {char_state.speech_style}")
+    if char_state.current_goal:
+        state_parts.append(f"Current goal: {char_state.current_goal}")
+    if char_state.inventory:
+        items = ", ".join(i['name'] for i in itertools.islice(char_state.inventory, 5))
+        state_parts.append(f"Carrying: {items}")
+    if char_state.relationships:
+        rels = ", ".join(f"{k} ({v.get('attitude', 'neutral')})" for k, v in itertools.islice(char_state.relationships.items(), 3))
+        state_parts.append(f"Relationships: {rels}")
+    return "\n".join(state_parts)
+
+
+def _build_character_messages(character: StoryCard, context: str,
+                              response_context: str, mood: str = "",
+                              adventure_id: int = None,
+                              char_state: Optional[CharacterState] = None,
+                              state_loaded: bool = False) -> list[dict]:
+    """Build the Character Voice messages for a specific NPC."""
     system_prompt = _load_prompt("character_response.md")
+    state_info = _describe_character_state(adventure_id, character.name, char_state, state_loaded)
 
-    # Get character state if available
-    state_info = ""
-    if adventure_id:
-        char_state = db.get_character_state_by_name(adventure_id, character.name)
-        if char_state:
-            state_parts = []
-            if char_state.personality_traits:
-                state_parts.append(f"Personality: {', '.join(char_state.personality_traits)}")
-            if char_state.values:
-                state_parts.append(f"Values: {', '.join(char_state.values)}")
-            if char_state.fears:
-                state_parts.append(f"Fears: {', '.join(char_state.fears)}")
-            if char_state.speech_style:
-                state_parts.append(f"Speech style: {char_state.speech_style}")
-            if char_state.current_goal:
-                state_parts.append(f"Current goal: {char_state.current_goal}")
-            if char_state.inventory:
-                items = [i['name'] for i in char_state.inventory[:5]]
-                state_parts.append(f"Carrying: {', '.join(items)}")
-            if char_state.relationships:
-                rels = [f"{k} ({v.get('attitude', 'neutral')})" for k, v in list(char_state.relationships.items())[:3]]
-                state_parts.append(f"Relationships: {', '.join(rels)}")
-            if state_parts:
-                state_info = "\n".join(state_parts)
-
-    user_message = f"""## Character: {character.name}
+    # The shared situation leads so every NPC call this turn has a byte-identical
+    # prefix for the server's prompt cache; character-specific material follows it
+    user_message = f"""## Situation Context
+{context}
+
+## Character: {character.name}
 
 ### Description
 {character.entry}
@@ -274,23 +545,63 @@ async def _call_character_voice(character: StoryCard, context: str,
 ### Current Mood
 {mood or "Neutral"}
 
-### Situation Context
-{context}
-
 ### What to respond to
 {response_context}
 
 Respond with the JSON structure as specified."""
 
-    kwargs = _get_llm_kwargs("character")
-    kwargs["messages"] = [
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message}
+    ]
+
+
+def _build_character_batch_messages(npcs: list[StoryCard], context: str,
+                                    response_contexts: list[str],
+                                    mood_by_name: dict[str, str],
+                                    adventure_id: int = None,
+                                    states_by_name: Optional[dict[str, Optional[CharacterState]]] = None) -> list[dict]:
+    """Build one Character Voice request covering several NPCs."""
+    system_prompt = _load_prompt("character_responses_batch.md")
+    states_by_name = states_by_name or {}
+
+    blocks = []
+    for npc, response_context in zip(npcs, response_contexts):
+        state_info = _describe_character_state(adventure_id, npc.name, states_by_name.get(npc.name),
+                                               npc.name in states_by_name)
+        blocks.append(f"""## Character: {npc.name}
+
+### Description
+{npc.entry}
+
+### Character Notes
+{npc.notes or "None provided"}
+
+### Character State
+{state_info or "No detailed state available"}
+
+### Current Mood
+{mood_by_name.get(npc.name) or "Neutral"}
+
+### What to respond to
+{response_context}""")
+
+    # Shared situation first so every character block reuses the same prefix
+    user_message = "\n\n".join([
+        f"## Situation Context\n{context}",
+        *blocks,
+        f"Respond with one entry per character ({', '.join(npc.name for npc in npcs)}) "
+        "using the JSON structure as specified.",
+    ])
+
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message}
     ]
 
-    response = completion(**kwargs)
-    response_text = response.choices[0].message.content
 
+def _parse_character_action(character: StoryCard, response_text: str) -> CharacterAction:
+    """Turn a Character Voice response into a CharacterAction."""
     result = _extract_json(response_text)
 
     return CharacterAction(
@@ -303,13 +614,111 @@ Respond with the JSON structure as specified."""
     )
 
 
-async def generate_opening_scene(adventure_id: int) -> dict:
-    """Generate the opening scene for a new adventure."""
-    adventure = db.get_adventure(adventure_id)
+async def _call_character_voice(character: StoryCard, context: str,
+                                response_context: str, mood: str = "",
+                                adventure_id: int = None,
+                                char_state: Optional[CharacterState] = None,
+                                state_loaded: bool = False) -> CharacterAction:
+    """Call the Character Voice LLM for a specific NPC (pass state_loaded to skip its state lookup)."""
+    kwargs = _get_llm_kwargs("character", max_tokens=CHARACTER_MAX_TOKENS, temperature=0.9, json_mode=True)
+    kwargs["messages"] = _build_character_messages(
+        character, context, response_context, mood, adventure_id, char_state, state_loaded
+    )
+
+    return _parse_character_action(character, await _complete(kwargs))
+
+
+async def _call_character_voices_concurrently(adventure_id: int, context: str,
+                                              items: list[tuple[StoryCard, str, str]],
+                                              states_by_name: Optional[dict[str, Optional[CharacterState]]] = None) -> list[CharacterAction]:
+    """
+    Generate responses for several NPCs concurrently.
+
+    Each item is (character, response_context, mood). The Character Voice calls
+    are in flight together so the model server can batch them. Results are
+    returned in the same order as items. Characters present in states_by_name
+    (a None value meaning no state) are not looked up again.
+    """
+    states_by_name = states_by_name or {}
+    return list(await asyncio.gather(*(
+        _call_character_voice(character, context, response_context, mood, adventure_id,
+                              states_by_name.get(character.name), character.name in states_by_name)
+        for character, response_context, mood in items
+    )))
+
+
+async def _call_character_voices_batch(npcs: list[StoryCard], context: str,
+                                      response_contexts: list[str],
+                                      mood_by_name: dict[str, str],
+                                      adventure_id: int = None,
+                                      states_by_name: Optional[dict[str, Optional[CharacterState]]] = None) -> list[CharacterAction]:
+    """
+    Voice several NPCs with a single Character Voice call.
+
+    The shared situation context is sent once instead of once per NPC. Any NPC
+    the model leaves out of the reply is voiced individually. Results are
+    returned in the same order as npcs.
+    """
+    kwargs = _get_llm_kwargs("character", max_tokens=CHARACTER_MAX_TOKENS * len(npcs),
+                             temperature=0.9, json_mode=True)
+    kwargs["messages"] = _build_character_batch_messages(
+        npcs, context, response_contexts, mood_by_name, adventure_id, states_by_name
+    )
+
+    # Anything but a {"responses": [...]} object counts as every NPC missing
+    parsed = _extract_json(await _complete(kwargs))
+    responses = parsed.get("responses", []) if isinstance(parsed, dict) else []
+    by_name = {
+        r.get("character_name", ""): r for r in responses if isinstance(r, dict)
+    }
+
+    actions: list[Optional[CharacterAction]] = []
+    missing = []
+    for npc, response_context in zip(npcs, response_contexts):
+        result = by_name.get(npc.name)
+        if result is None:
+            missing.append((len(actions), npc, response_context))
+            actions.append(None)
+            continue
+        actions.append(CharacterAction(
+            character_name=npc.name,
+            character_id=npc.id,
+            action=result.get("action", ""),
+            speech=result.get("speech", ""),
+            inner_thought=result.get("inner_thought", ""),
+            is_pc=False
+        ))
+
+    if missing:
+        logger.warning("Batched Character Voice skipped %d NPC(s); voicing them individually", len(missing))
+        fallbacks = await _call_character_voices_concurrently(adventure_id, context, [
+            (npc, response_context, mood_by_name.get(npc.name, ""))
+            for _, npc, response_context in missing
+        ], states_by_name)
+        for (index, _, _), action in zip(missing, fallbacks):
+            actions[index] = action
+
+    return actions
+
+
+async def _load(value, fetch, *args):
+    """Return an object the caller already loaded, or await its async lookup."""
+    if value is not None:
+        return value
+    return await fetch(*args)
+
+
+def _prepare_opening(adventure_id: int, adventure: Optional[Adventure],
+                     scenario: Optional[Scenario]) -> tuple[dict, Scenario, list[StoryCard], list[StoryCard]]:
+    """Load the adventure/scenario and build the opening scene request.
+
+    Returns (llm kwargs, scenario, playing characters, locations).
+    """
+    adventure = adventure or db.get_adventure(adventure_id)
     if not adventure:
         raise ValueError(f"Adventure {adventure_id} not found")
 
-    scenario = db.get_scenario(adventure.scenario_id)
+    scenario = scenario or db.get_scenario(adventure.scenario_id)
     if not scenario:
         raise ValueError(f"Scenario {adventure.scenario_id} not found")
 
@@ -323,37 +732,40 @@ async def generate_opening_scene(adventure_id: int) -> dict:
 
     context_parts = [
         f"## Scenario: {scenario.title}",
-        f"\n### Description\n{scenario.description}" if scenario.description else "",
-        f"\n### Initial Story\n{scenario.plot.story}" if scenario.plot.story else "",
+        "\n### Description\n" + scenario.description if scenario.description else "",
+        "\n### Initial Story\n" + scenario.plot.story if scenario.plot.story else "",
     ]
 
     if pcs:
-        pc_text = "\n".join([f"- {c.name}: {c.entry}" for c in pcs])
-        context_parts.append(f"\n### Playing Characters\n{pc_text}")
+        pc_text = "\n".join(f"- {c.name}: {c.entry}" for c in pcs)
+        context_parts.append("\n### Playing Characters\n" + pc_text)
 
     if npcs:
-        npc_text = "\n".join([f"- {c.name}: {c.entry}" for c in npcs])
-        context_parts.append(f"\n### NPCs\n{npc_text}")
+        npc_text = "\n".join(f"- {c.name}: {c.entry}" for c in npcs)
+        context_parts.append("\n### NPCs\n" + npc_text)
 
     if locations:
-        loc_text = "\n".join([f"- {c.name}: {c.entry}" for c in locations])
-        context_parts.append(f"\n### Locations\n{loc_text}")
+        loc_text = "\n".join(f"- {c.name}: {c.entry}" for c in locations)
+        context_parts.append("\n### Locations\n" + loc_text)
 
     if scenario.plot.ai_instructions:
-        context_parts.append(f"\n### AI Instructions\n{scenario.plot.ai_instructions}")
+        context_parts.append("\n### AI Instructions\n" + scenario.plot.ai_instructions)
 
     user_message = "\n".join(context_parts)
     user_message += "\n\n## Your Task\nGenerate an engaging opening scene. Set the stage, describe the environment, and present a situation for the players."
 
-    kwargs = _get_llm_kwargs("story")
+    kwargs = _get_llm_kwargs("story", max_tokens=OPENING_MAX_TOKENS, temperature=0.8)
     kwargs["messages"] = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message}
     ]
 
-    response = completion(**kwargs)
-    opening_narration = response.choices[0].message.content
+    return kwargs, scenario, pcs, locations
 
+
+def _save_opening(adventure_id: int, scenario: Scenario, pcs: list[StoryCard],
+                  locations: list[StoryCard], opening_narration: str) -> dict:
+    """Persist the initial scene, character states and opening event."""
     # Set up initial scene
     initial_scene = Scene(
         adventure_id=adventure_id,
@@ -385,12 +797,56 @@ async def generate_opening_scene(adventure_id: int) -> dict:
     }
 
 
+async def generate_opening_scene(adventure_id: int, *, adventure: Optional[Adventure] = None,
+                                 scenario: Optional[Scenario] = None) -> dict:
+    """Generate the opening scene for a new adventure."""
+    kwargs, scenario, pcs, locations = _prepare_opening(adventure_id, adventure, scenario)
+
+    opening_narration = await _complete(kwargs)
+
+    return _save_opening(adventure_id, scenario, pcs, locations, opening_narration)
+
+
+async def stream_opening_scene(adventure_id: int, *, adventure: Optional[Adventure] = None,
+                               scenario: Optional[Scenario] = None) -> AsyncIterator[str]:
+    """
+    Generate the opening scene, yielding narration text as the model produces it.
+
+    The scene, character states and opening event are saved once the stream
+    completes; an interrupted stream leaves the adventure untouched. The final
+    chunk is STREAM_RESULT_SEPARATOR followed by the opening result as JSON (the
+    same dict generate_opening_scene returns), or by {"error": ...} if it failed.
+    """
+    try:
+        kwargs, scenario, pcs, locations = _prepare_opening(adventure_id, adventure, scenario)
+        kwargs["stream"] = True
+
+        chunks = []
+        response = await acompletion(**kwargs)
+        async for chunk in response:
+            text = chunk.choices[0].delta.content
+            if text:
+                chunks.append(text)
+                yield text
+
+        result = _save_opening(adventure_id, scenario, pcs, locations, "".join(chunks))
+    except Exception as e:
+        logger.exception("Streamed opening failed for adventure %s", adventure_id)
+        result = {"error": str(e)}
+
+    yield STREAM_RESULT_SEPARATOR + orjson.dumps(result).decode()
+
+
 async def continue_story(adventure_id: int, player_input: str,
                          action_type: ActionType = ActionType.DO,
-                         actor_name: str = "") -> dict:
+                         actor_name: str = "", *,
+                         adventure: Optional[Adventure] = None,
+                         scenario: Optional[Scenario] = None) -> dict:
     """
     Continue the story based on player input using multi-LLM orchestration.
 
+    Callers that already hold the adventure/scenario can pass them to skip the lookups.
+
     Flow:
     1. Story Orchestrator determines what happens and who responds
     2. Character Voice is called for each NPC that should respond
@@ -403,64 +859,138 @@ async def continue_story(adventure_id: int, player_input: str,
     - pc_prompts: Prompts for PC input (if any)
     - awaiting_pc_input: Whether we need PC response to continue
     """
-    adventure = db.get_adventure(adventure_id)
+    context, scene_chars = await _load_turn_context(adventure_id, adventure, scenario)
+
+    # Step 1: Call Story Orchestrator
+    orchestrator_result = await _call_story_orchestrator(
+        context, player_input, actor_name, action_type
+    )
+
+    return await _resolve_turn(adventure_id, context, scene_chars, orchestrator_result,
+                               player_input, action_type, actor_name)
+
+
+async def stream_continue_story(adventure_id: int, player_input: str,
+                                action_type: ActionType = ActionType.DO,
+                                actor_name: str = "", *,
+                                adventure: Optional[Adventure] = None,
+                                scenario: Optional[Scenario] = None) -> AsyncIterator[str]:
+    """
+    Continue the story, yielding the raw Story Orchestrator output as it streams.
+
+    Chunks are buffered and the JSON is parsed once, after the stream ends;
+    the NPC voices and the event are then generated and saved exactly as in
+    continue_story. The final chunk is STREAM_RESULT_SEPARATOR followed by the
+    turn result as JSON (the same dict continue_story returns), or by
+    {"error": ...} if the turn failed after streaming began.
+    """
+    try:
+        context, scene_chars = await _load_turn_context(adventure_id, adventure, scenario)
+
+        kwargs = _build_orchestrator_kwargs(context, player_input, actor_name, action_type)
+        kwargs["stream"] = True
+
+        chunks = []
+        response = await acompletion(**kwargs)
+        async for chunk in response:
+            text = chunk.choices[0].delta.content
+            if text:
+                chunks.append(text)
+                yield text
+
+        orchestrator_result = _parse_orchestrator_result("".join(chunks))
+        result = await _resolve_turn(adventure_id, context, scene_chars, orchestrator_result,
+                                     player_input, action_type, actor_name)
+    except Exception as e:
+        logger.exception("Streamed turn failed for adventure %s", adventure_id)
+        result = {"error": str(e)}
+
+    yield STREAM_RESULT_SEPARATOR + orjson.dumps(result).decode()
+
+
+async def _load_turn_context(adventure_id: int, adventure: Optional[Adventure],
+                             scenario: Optional[Scenario]) -> tuple[str, dict]:
+    """
+    Return the story context and scene characters for the next turn.
+
+    Both are reused from the context cache while the adventure's context_version
+    is unchanged, skipping the scenario, scene-character and event lookups.
+    """
+    adventure = await _load(adventure, db.aget_adventure, adventure_id)
     if not adventure:
         raise ValueError(f"Adventure {adventure_id} not found")
 
-    scenario = db.get_scenario(adventure.scenario_id)
+    key = (adventure_id, adventure.context_version)
+    cached = _context_cache.get(key)
+    if cached:
+        _context_cache.move_to_end(key)
+        return cached
+
+    scenario, scene_chars, recent_events = await asyncio.gather(
+        _load(scenario, db.aget_scenario, adventure.scenario_id),
+        db.aget_scene_chars_with_states(adventure_id, adventure.scenario_id),
+        db.aget_recent_events(adventure_id, 5, 150),
+    )
     if not scenario:
         raise ValueError(f"Scenario {adventure.scenario_id} not found")
 
-    # Build context
-    context = _build_context(adventure, scenario)
+    context = _build_context(adventure, scenario, scene_chars, recent_events)
+    _context_cache[key] = (context, scene_chars)
+    if len(_context_cache) > CONTEXT_CACHE_MAX:
+        _context_cache.popitem(last=False)
+    return context, scene_chars
 
-    # Step 1: Call Story Orchestrator
-    orchestrator_result = await _call_story_orchestrator(
-        context, player_input, actor_name, action_type
-    )
 
+async def _resolve_turn(adventure_id: int, context: str, scene_chars: dict,
+                        orchestrator_result: dict, player_input: str,
+                        action_type: ActionType, actor_name: str) -> dict:
+    """Voice the responding NPCs, save the event and return the turn result."""
     narration = orchestrator_result.get("narration", "")
     scene_update = orchestrator_result.get("scene_update", {})
     npc_responses = orchestrator_result.get("npc_responses", [])
     pc_prompts = orchestrator_result.get("pc_prompts", [])
     awaiting_pc_input = orchestrator_result.get("awaiting_pc_input", False)
 
-    # Step 2: Generate NPC responses
-    character_actions = []
-
-    # Get NPCs in scene
-    chars_in_scene = db.get_characters_in_scene(adventure_id, scenario.id)
-    npc_map = {npc.name: npc for npc in chars_in_scene["npcs"]}
+    # Step 2: Generate NPC responses for the NPCs in scene, reusing the states loaded with the context
+    # (every NPC is in state_map, with None if it has no state, so nothing is looked up again)
+    npc_map = {npc.name: npc for npc, _ in scene_chars["npcs"]}
+    state_map = {npc.name: state for npc, state in scene_chars["npcs"]}
 
+    voice_items = []
     for npc_response in npc_responses:
         npc_name = npc_response.get("character_name", "")
         should_respond = npc_response.get("should_respond", False)
 
         if should_respond and npc_name in npc_map:
-            npc_card = npc_map[npc_name]
             response_context = npc_response.get("response_context", player_input)
             mood = npc_response.get("suggested_mood", "")
+            voice_items.append((npc_map[npc_name], response_context, mood))
+
+    # Voice all responding NPCs in one call; a lone responder keeps the smaller per-NPC prompt
+    if len(voice_items) >= BATCH_VOICE_MIN_RESPONDERS:
+        character_actions = await _call_character_voices_batch(
+            [npc for npc, _, _ in voice_items],
+            context,
+            [response_context for _, response_context, _ in voice_items],
+            {npc.name: mood for npc, _, mood in voice_items},
+            adventure_id,
+            state_map,
+        )
+    else:
+        character_actions = await _call_character_voices_concurrently(adventure_id, context, voice_items, state_map)
 
-            # Call Character Voice for this NPC
-            char_action = await _call_character_voice(
-                npc_card, context, response_context, mood, adventure_id
-            )
-            character_actions.append(char_action)
-
-            # Update character mood if provided
-            if mood:
-                db.update_character_mood(adventure_id, npc_name, mood)
+    # Step 3: Save the event and any suggested NPC moods together
+    db.apply_turn(adventure_id, event={
+        "action_type": action_type,
+        "player_input": player_input,
+        "narration": narration,
+        "actor_name": actor_name,
+        "character_actions": character_actions,
+        "scene_update": scene_update if scene_update else None,
+    }, mood_updates={npc.name: mood for npc, _, mood in voice_items if mood})
 
-    # Step 3: Save the event
-    db.add_event(
-        adventure_id=adventure_id,
-        action_type=action_type,
-        player_input=player_input,
-        narration=narration,
-        actor_name=actor_name,
-        character_actions=character_actions,
-        scene_update=scene_update if scene_update else None
-    )
+    # Step 4: Refresh the story summary in the background, off the player's turn
+    schedule_summary_update(adventure_id)
 
     return {
         "narration": narration,
@@ -472,13 +1002,15 @@ async def continue_story(adventure_id: int, player_input: str,
 
 
 async def add_pc_action(adventure_id: int, pc_name: str,
-                        action: str = "", speech: str = "") -> CharacterAction:
+                        action: str = "", speech: str = "", *,
+                        adventure: Optional[Adventure] = None,
+                        scenario: Optional[Scenario] = None) -> CharacterAction:
     """Add a Playing Character's action/speech to the story."""
-    adventure = db.get_adventure(adventure_id)
+    adventure = adventure or db.get_adventure(adventure_id)
     if not adventure:
         raise ValueError(f"Adventure {adventure_id} not found")
 
-    scenario = db.get_scenario(adventure.scenario_id)
+    scenario = scenario or db.get_scenario(adventure.scenario_id)
     if not scenario:
         raise ValueError(f"Scenario {adventure.scenario_id} not found")
 
@@ -526,19 +1058,19 @@ async def add_pc_action(adventure_id: int, pc_name: str,
     return pc_action
 
 
-async def create_npc(scenario_id: int, creation_context: str) -> dict:
+async def create_npc(scenario_id: int, creation_context: str, *,
+                     scenario: Optional[Scenario] = None) -> dict:
     """Generate a new NPC based on context."""
-    scenario = db.get_scenario(scenario_id)
+    scenario = scenario or db.get_scenario(scenario_id)
     if not scenario:
         raise ValueError(f"Scenario {scenario_id} not found")
 
     system_prompt = _load_prompt("npc_creation.md")
 
-    existing_chars = [
-        card for card in scenario.story_cards
-        if card.type == StoryCardType.CHARACTER
-    ]
-    existing_chars_text = ", ".join([c.name for c in existing_chars]) if existing_chars else "None yet"
+    # The scenario (usually from the TTL cache) already holds its cards, so no extra query for the names
+    existing_chars_text = ", ".join(
+        card.name for card in scenario.story_cards if card.type == StoryCardType.CHARACTER
+    ) or "None yet"
 
     context_parts = [
         f"## Setting\n{scenario.description}" if scenario.description else "",
@@ -550,34 +1082,35 @@ async def create_npc(scenario_id: int, creation_context: str) -> dict:
     user_message = "\n".join(filter(None, context_parts))
     user_message += "\n\n## Your Task\nCreate a new character that fits this world and context."
 
-    kwargs = _get_llm_kwargs("story")
+    kwargs = _get_llm_kwargs("story", max_tokens=NPC_CREATION_MAX_TOKENS, temperature=0.9)
     kwargs["messages"] = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message}
     ]
 
-    response = completion(**kwargs)
-    return {"raw_response": response.choices[0].message.content}
+    return {"raw_response": await _complete(kwargs)}
 
 
-async def update_story_summary(adventure_id: int) -> str:
+async def update_story_summary(adventure_id: int, *, adventure: Optional[Adventure] = None) -> str:
     """Update the story summary based on recent events."""
-    adventure = db.get_adventure(adventure_id)
+    _events_since_summary.pop(adventure_id, None)
+
+    adventure = adventure or db.get_adventure(adventure_id)
     if not adventure:
         raise ValueError(f"Adventure {adventure_id} not found")
 
-    recent_events = db.get_recent_events(adventure_id, limit=10)
+    recent_events = db.get_recent_events(adventure_id, limit=5, snippet_len=100)
     if not recent_events:
         return adventure.current_story_summary
 
     # Format new events
     event_summaries = []
-    for event in recent_events[-5:]:
+    for event in recent_events:
         parts = []
         if event.actor_name and event.player_input:
             parts.append(f"- {event.actor_name}: {event.player_input}")
         if event.narration:
-            parts.append(f"  {event.narration[:100]}...")
+            parts.append(f"  {event.narration}...")
         for ca in event.character_actions:
             if ca.speech:
                 parts.append(f"  {ca.character_name}: \"{ca.speech[:50]}...\"")
@@ -596,15 +1129,48 @@ async def update_story_summary(adventure_id: int) -> str:
 ## Your Task
 Update the story summary to incorporate these new events. Keep it under 300 words and focus on key plot points, character developments, and unresolved threads."""
 
-    kwargs = _get_llm_kwargs("story")
+    kwargs = _get_llm_kwargs("story", max_tokens=SUMMARY_MAX_TOKENS)
     kwargs["messages"] = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_message}
     ]
 
-    response = completion(**kwargs)
-    new_summary = response.choices[0].message.content
+    new_summary = await _complete(kwargs)
 
-    db.update_adventure(adventure_id, current_story_summary=new_summary)
+    # Only the summary column is written, so a turn saved meanwhile keeps its scene changes
+    db.apply_turn(adventure_id, summary=new_summary)
 
     return new_summary
+
+
+# Background summary refreshes: one per SUMMARY_EVERY_N_EVENTS turns per adventure
+SUMMARY_EVERY_N_EVENTS = 5
+_events_since_summary: dict[int, int] = {}
+_summary_tasks: dict[int, asyncio.Task] = {}
+
+
+async def _run_summary_update(adventure_id: int):
+    """Background wrapper for update_story_summary that logs instead of raising."""
+    try:
+        await update_story_summary(adventure_id)
+    except Exception:
+        logger.exception("Background summary update failed for adventure %s", adventure_id)
+
+
+def schedule_summary_update(adventure_id: int) -> Optional[asyncio.Task]:
+    """
+    Count a new event and, once SUMMARY_EVERY_N_EVENTS have accumulated,
+    start a fire-and-forget summary update for the adventure.
+
+    Returns the task if one was started. At most one update per adventure
+    runs at a time.
+    """
+    count = _events_since_summary.get(adventure_id, 0) + 1
+    _events_since_summary[adventure_id] = count
+    if count < SUMMARY_EVERY_N_EVENTS or adventure_id in _summary_tasks:
+        return None
+
+    task = asyncio.create_task(_run_summary_update(adventure_id))
+    _summary_tasks[adventure_id] = task
+    task.add_done_callback(lambda _: _summary_tasks.pop(adventure_id, None))
+    return task
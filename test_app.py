@@ -1,76 +1,297 @@
-from fastapi.testclient import TestClient
-from main import app
-import sys
+import asyncio
+import json
+import types
 
-client = TestClient(app)
+import pytest
 
-def test_read_main():
+from models.lore import ActionType, CharacterAction, StoryCard, StoryCardType
+from services import lore_llm_service
+from services.lore_llm_service import STREAM_RESULT_SEPARATOR, _find_balanced_json, _fit_context
+
+def test_read_main(client):
     response = client.get("/")
     assert response.status_code == 200
     assert "AI Chat" in response.text
 
-def test_get_settings():
+def test_get_settings(client):
     response = client.get("/settings")
     assert response.status_code == 200
     assert "Settings" in response.text
 
-def test_get_chat():
+def test_get_chat(client):
     response = client.get("/chat")
     assert response.status_code == 200
     assert "Chat with" in response.text
 
-def test_update_settings_html():
+# Tests that change the shared LLM settings stay on one xdist worker (--dist loadgroup)
+@pytest.mark.xdist_group(name="settings")
+def test_update_settings_html(client):
     response = client.post("/settings", data={"model": "test-model", "api_base": "http://test"})
     assert response.status_code == 200
     assert "test-model" in response.text
 
-def test_chat_endpoint_html():
-    try:
-        response = client.post("/chat", data={"message": "Hello"})
-        assert response.status_code == 200
-        assert "Hello" in response.text
-    except Exception as e:
-        print(f"Chat HTML test failed with: {e}")
+def test_chat_endpoint_html(client):
+    # LLM errors are rendered into the page, so this succeeds without a model server
+    response = client.post("/chat", data={"message": "Hello"})
+    assert response.status_code == 200
+    assert "Hello" in response.text
 
-def test_update_settings_json():
+@pytest.mark.xdist_group(name="settings")
+def test_update_settings_json(client):
     response = client.post("/api/settings", json={"model": "json-model", "api_base": "http://json"})
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "success"
     assert data["settings"]["model"] == "json-model"
 
-def test_chat_endpoint_json():
-    try:
-        response = client.post("/api/chat", json={"message": "Hello JSON"})
-        # Might fail if no LLM key, but check if it returns 500 (which means it tried) or 200
-        if response.status_code == 200:
-            data = response.json()
-            assert "content" in data
+def test_chat_endpoint_json(client):
+    response = client.post("/api/chat", json={"message": "Hello JSON"})
+    # 500 means the request reached the LLM call but no model server answered
+    assert response.status_code in (200, 500)
+    if response.status_code == 200:
+        assert "content" in response.json()
+
+def test_fit_context_keeps_newest_event_over_budget():
+    static = ["x" * 400]
+    history = ["*old narration*", "**Hero** (do): looks", "*Bob waves*"]
+    context = _fit_context(static, history, budget_tokens=10, min_lines=2)
+    assert "**Hero** (do): looks\n*Bob waves*" in context
+    assert "old narration" not in context
+
+def test_request_cache_sees_writes_in_same_request(lore_db):
+    scenario = lore_db.create_scenario("Old title")
+    with lore_db.request_cache():
+        assert lore_db.get_scenario(scenario.id).title == "Old title"
+        lore_db.update_scenario(scenario.id, title="New title")
+        lore_db.create_story_card(scenario.id, "Bob", StoryCardType.CHARACTER, "an npc")
+        reread = lore_db.get_scenario(scenario.id)
+        assert reread.title == "New title"
+        assert [card.name for card in reread.story_cards] == ["Bob"]
+
+def test_listings_report_timestamps_and_omit_unloaded_fields(client, lore_db):
+    scenario = lore_db.create_scenario("Listed")
+    lore_db.create_adventure(scenario.id)
+
+    scenarios = client.get("/api/lore/scenarios").json()["scenarios"]
+    assert scenarios[0]["updated_at"]
+    assert "plot" not in scenarios[0]
+
+    adventures = client.get("/api/lore/adventures").json()["adventures"]
+    assert adventures[0]["updated_at"]
+    assert "current_scene" not in adventures[0]
+
+def test_scene_update_sets_only_scene_fields(lore_db):
+    scenario = lore_db.create_scenario("Scene")
+    adventure = lore_db.create_adventure(scenario.id)
+    lore_db.add_event(adventure.id, ActionType.STORY, "", scene_update={
+        "location_name": "Tavern", "mood": "tense", "characters_enter": ["Bob", "Ann"],
+    })
+    lore_db.add_event(adventure.id, ActionType.STORY, "", scene_update={
+        "location_name": None, "characters_exit": ["Bob"],
+    })
+    scene = lore_db.get_adventure(adventure.id).current_scene
+    assert scene.location_name is None
+    assert scene.mood == "tense"
+    assert scene.characters_present == ["Ann"]
+    assert scene.adventure_id is None
+
+def test_add_item_stacks_by_name(lore_db):
+    scenario = lore_db.create_scenario("Items")
+    adventure = lore_db.create_adventure(scenario.id)
+    lore_db.create_character_state(adventure.id, "Hero")
+    lore_db.add_item_to_character(adventure.id, "Hero", "Coin", quantity=2)
+    lore_db.add_item_to_character(adventure.id, "Hero", "Rope")
+    state = lore_db.add_item_to_character(adventure.id, "Hero", "Coin", quantity=3)
+    assert [(item["name"], item["quantity"]) for item in state.inventory] == [("Coin", 5), ("Rope", 1)]
+
+def test_recent_history_returns_latest_n_in_order(lore_db):
+    scenario = lore_db.create_scenario("History")
+    adventure = lore_db.create_adventure(scenario.id)
+    for i in range(5):
+        lore_db.add_event(adventure.id, ActionType.DO, f"turn {i}", character_actions=[
+            CharacterAction("Bob", action=f"step {i}a"), CharacterAction("Bob", action=f"step {i}b"),
+        ])
+    assert [e.player_input for e in lore_db.get_recent_events(adventure.id, limit=3)] == ["turn 2", "turn 3", "turn 4"]
+    actions = lore_db.get_character_action_history(adventure.id, "Bob", limit=3)
+    assert [a.action for a in actions] == ["step 3b", "step 4a", "step 4b"]
+
+def test_find_balanced_json():
+    text = 'Sure! {"a": {"b": "}"}, "c": [1]} trailing {"d": 2}'
+    start, end = _find_balanced_json(text)
+    assert text[start:end] == '{"a": {"b": "}"}, "c": [1]}'
+    start, end = _find_balanced_json(text, end)
+    assert text[start:end] == '{"d": 2}'
+    assert _find_balanced_json('no json {"open": 1') is None
+
+def test_stream_action_rejects_invalid_action_type(client, lore_db):
+    adventure = lore_db.create_adventure(lore_db.create_scenario("Stream").id)
+    response = client.post(f"/api/lore/adventures/{adventure.id}/action/stream",
+                           json={"player_input": "hi", "action_type": "dance"})
+    assert response.status_code == 400
+
+def test_stream_action_ends_with_turn_result_or_error(client, lore_db, monkeypatch):
+    adventure = lore_db.create_adventure(lore_db.create_scenario("Stream").id)
+    reply = json.dumps({"narration": "The fire crackles.", "npc_responses": []})
+
+    async def fake_stream():
+        for i in range(0, len(reply), 8):
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=reply[i:i + 8]))])
+
+    async def fake_acompletion(**kwargs):
+        return fake_stream()
+
+    monkeypatch.setattr(lore_llm_service, "acompletion", fake_acompletion)
+    url = f"/api/lore/adventures/{adventure.id}/action/stream"
+    streamed, result = client.post(url, json={"player_input": "hi"}).text.split(STREAM_RESULT_SEPARATOR)
+    assert streamed == reply
+    assert json.loads(result)["narration"] == "The fire crackles."
+
+    async def failing_acompletion(**kwargs):
+        raise RuntimeError("model server down")
+
+    monkeypatch.setattr(lore_llm_service, "acompletion", failing_acompletion)
+    response = client.post(url, json={"player_input": "hi"})
+    assert response.status_code == 200
+    assert json.loads(response.text.split(STREAM_RESULT_SEPARATOR)[-1]) == {"error": "model server down"}
+
+def test_stream_start_checks_scenario_and_ends_with_result_or_error(client, lore_db, monkeypatch):
+    orphan = lore_db.create_adventure(lore_db.create_scenario("Gone").id)
+    lore_db.delete_scenario(orphan.scenario_id)  # foreign keys are not enforced
+    assert client.post(f"/api/lore/adventures/{orphan.id}/start/stream").status_code == 404
+
+    adventure = lore_db.create_adventure(lore_db.create_scenario("Opening").id)
+    url = f"/api/lore/adventures/{adventure.id}/start/stream"
+
+    async def fake_stream():
+        for text in ("Once upon ", "a time."):
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=text))])
+
+    async def fake_acompletion(**kwargs):
+        return fake_stream()
+
+    monkeypatch.setattr(lore_llm_service, "acompletion", fake_acompletion)
+    streamed, result = client.post(url).text.split(STREAM_RESULT_SEPARATOR)
+    assert streamed == "Once upon a time."
+    assert json.loads(result)["narration"] == "Once upon a time."
+
+    async def failing_acompletion(**kwargs):
+        raise RuntimeError("model server down")
+
+    monkeypatch.setattr(lore_llm_service, "acompletion", failing_acompletion)
+    response = client.post(url)
+    assert response.status_code == 200
+    assert json.loads(response.text.split(STREAM_RESULT_SEPARATOR)[-1]) == {"error": "model server down"}
+
+@pytest.mark.parametrize("batch_reply, voiced_individually", [
+    ({"responses": [{"character_name": "Bob", "speech": "Bob (batch)"},
+                    {"character_name": "Cat", "speech": "Cat (batch)"},
+                    {"character_name": "Dan", "speech": "Dan (batch)"}]}, []),
+    ({"responses": [{"character_name": "Dan", "speech": "Dan (batch)"},
+                    {"character_name": "Bob", "speech": "Bob (batch)"}]}, ["Cat"]),
+    ([{"character_name": "Bob", "speech": "Bob (batch)"}], ["Bob", "Cat", "Dan"]),
+])
+def test_batched_character_voices_fall_back_per_npc(monkeypatch, batch_reply, voiced_individually):
+    npcs = [StoryCard(name=name, type=StoryCardType.CHARACTER) for name in ("Bob", "Cat", "Dan")]
+    batch_prompt = lore_llm_service._load_prompt("character_responses_batch.md")
+    single_calls = []
+
+    async def fake_acompletion(**kwargs):
+        if kwargs["messages"][0]["content"] == batch_prompt:
+            reply = batch_reply
         else:
-            print(f"JSON Chat returned {response.status_code}: {response.text}")
-    except Exception as e:
-        print(f"Chat JSON test failed with: {e}")
-
-if __name__ == "__main__":
-    try:
-        test_read_main()
-        print("GET / passed")
-        test_get_settings()
-        print("GET /settings passed")
-        test_get_chat()
-        print("GET /chat passed")
-        test_update_settings_html()
-        print("POST /settings (HTML) passed")
-        test_chat_endpoint_html()
-        print("POST /chat (HTML) passed")
-        test_update_settings_json()
-        print("POST /api/settings (JSON) passed")
-        test_chat_endpoint_json()
-        print("POST /api/chat (JSON) passed")
-        print("All tests passed!")
-    except AssertionError as e:
-        print(f"Test failed: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        sys.exit(1)
+            name = next(npc.name for npc in npcs if f"## Character: {npc.name}\n" in kwargs["messages"][-1]["content"])
+            single_calls.append(name)
+            reply = {"speech": f"{name} (single)"}
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=json.dumps(reply)))])
+
+    monkeypatch.setattr(lore_llm_service, "acompletion", fake_acompletion)
+    actions = asyncio.run(lore_llm_service._call_character_voices_batch(
+        npcs, "context", ["greet"] * 3, {}
+    ))
+    assert [a.character_name for a in actions] == ["Bob", "Cat", "Dan"]
+    assert [a.speech for a in actions] == [
+        f"{npc.name} (single)" if npc.name in voiced_individually else f"{npc.name} (batch)" for npc in npcs
+    ]
+    assert sorted(single_calls) == voiced_individually
+
+def test_context_cache_follows_database_context_version(lore_db, monkeypatch):
+    scenario = lore_db.create_scenario("Cached")
+    adventure = lore_db.create_adventure(scenario.id)
+    lore_llm_service._context_cache.clear()
+    loads = []
+
+    async def counting_scene_chars(adventure_id, scenario_id):
+        loads.append(adventure_id)
+        return lore_db.get_scene_chars_with_states(adventure_id, scenario_id)
+
+    monkeypatch.setattr(lore_db, "aget_scene_chars_with_states", counting_scene_chars)
+    first, _ = asyncio.run(lore_llm_service._load_turn_context(adventure.id, None, None))
+    again, _ = asyncio.run(lore_llm_service._load_turn_context(adventure.id, None, None))
+    assert again == first and len(loads) == 1
+
+    # Writes made through any table the context reads from move the version on
+    version = lore_db.get_adventure(adventure.id).context_version
+    lore_db.create_character_state(adventure.id, "Bob")
+    lore_db.create_story_card(scenario.id, "Bob", StoryCardType.CHARACTER, "an npc")
+    lore_db.add_event(adventure.id, ActionType.STORY, "", narration="Rain falls.")
+    assert lore_db.get_adventure(adventure.id).context_version > version
+
+    rebuilt, _ = asyncio.run(lore_llm_service._load_turn_context(adventure.id, None, None))
+    assert "Rain falls." in rebuilt and len(loads) == 2
+    lore_llm_service._context_cache.clear()
+
+def test_schedule_summary_update_debounces_per_adventure(lore_db, monkeypatch):
+    adventure = lore_db.create_adventure(lore_db.create_scenario("Summary").id)
+    real_update = lore_llm_service.update_story_summary
+    monkeypatch.setattr(lore_llm_service, "_events_since_summary", {})
+    monkeypatch.setattr(lore_llm_service, "_summary_tasks", {})
+    started = []
+
+    async def drive():
+        release = asyncio.Event()
+
+        async def fake_update(adventure_id, **kwargs):
+            started.append(adventure_id)
+            await release.wait()
+
+        monkeypatch.setattr(lore_llm_service, "update_story_summary", fake_update)
+        schedule = lore_llm_service.schedule_summary_update
+        for _ in range(lore_llm_service.SUMMARY_EVERY_N_EVENTS - 1):
+            assert schedule(adventure.id) is None
+        task = schedule(adventure.id)
+        assert task is not None
+        await asyncio.sleep(0)
+        assert started == [adventure.id]
+
+        # Further events while the update runs don't start another one
+        assert schedule(adventure.id) is None
+        release.set()
+        await task
+        assert started == [adventure.id]
+        assert adventure.id not in lore_llm_service._summary_tasks
+
+        # A manual summary restarts the count
+        await real_update(adventure.id)
+        assert lore_llm_service._events_since_summary.get(adventure.id) is None
+
+    asyncio.run(drive())
+
+def test_apply_turn_writes_moods_and_event_together(lore_db):
+    adventure = lore_db.create_adventure(lore_db.create_scenario("Turn").id)
+    lore_db.create_character_state(adventure.id, "Bob")
+    event = lore_db.apply_turn(adventure.id, event={
+        "action_type": ActionType.DO, "player_input": "wave",
+    }, mood_updates={"Bob": "cheerful"})
+    assert [e.id for e in lore_db.get_recent_events(adventure.id)] == [event.id]
+    assert lore_db.get_character_state_by_name(adventure.id, "Bob").current_mood == "cheerful"
+
+def test_apply_turn_writes_nothing_when_event_insert_fails(lore_db):
+    adventure = lore_db.create_adventure(lore_db.create_scenario("Turn").id)
+    lore_db.create_character_state(adventure.id, "Bob")
+    with pytest.raises(AttributeError):
+        # A plain string has no .value, so the event insert fails after the mood update ran
+        lore_db.apply_turn(adventure.id, event={
+            "action_type": "do", "player_input": "wave",
+        }, mood_updates={"Bob": "cheerful"})
+    assert lore_db.get_recent_events(adventure.id) == []
+    assert lore_db.get_character_state_by_name(adventure.id, "Bob").current_mood == ""